@@ -0,0 +1,29 @@
+"""Outils communs aux caches disque du projet."""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Écrit un fichier via un fichier temporaire renommé à la fin.
+
+    Un lancement interrompu (ou concurrent) ne laisse jamais de fichier de
+    cache tronqué : l'ancien contenu reste en place jusqu'au renommage.
+
+    Args:
+        path: Fichier à écrire
+        data: Contenu du fichier
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
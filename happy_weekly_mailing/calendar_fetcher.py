@@ -1,27 +1,278 @@
 """Module pour récupérer les événements du calendrier Google."""
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import ClassVar, List, Dict, Any
 from urllib.parse import quote
+import json
+import logging
+import re
+import time
+import zlib
 import requests
-import pytz
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from icalendar import Calendar
+from zoneinfo import ZoneInfo
+
+from .cache import write_atomic
+
+# Rattaché au logger du script (voir main._setup_logging)
+logger = logging.getLogger('happy.calendar_fetcher')
+
+
+def _build_session() -> requests.Session:
+    """
+    Crée la session HTTP partagée par tous les fetchers.
+
+    La connexion keep-alive vers calendar.google.com est réutilisée d'un
+    appel à l'autre, ce qui évite de refaire DNS + TCP + TLS à chaque flux.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=4,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Fuseau horaire par défaut de l'association, résolu une seule fois
+DEFAULT_TIMEZONE = "Europe/Paris"
+_DEFAULT_TZ = ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def _resolve_timezone(timezone: str | tzinfo | None) -> tzinfo:
+    """
+    Retourne le fuseau correspondant à un nom ou à un objet déjà construit.
+
+    Args:
+        timezone: Nom IANA, objet tzinfo (zoneinfo, pytz...) ou None
+
+    Returns:
+        Fuseau horaire (Europe/Paris par défaut)
+    """
+    if not timezone:
+        return _DEFAULT_TZ
+    if isinstance(timezone, str):
+        return ZoneInfo(timezone)
+    return timezone
+
+
+def _localize(tz: tzinfo, dt: datetime) -> datetime:
+    """Attache un fuseau à un datetime naïf, que le fuseau soit pytz ou non."""
+    localize = getattr(tz, 'localize', None)
+    return localize(dt) if localize else dt.replace(tzinfo=tz)
+
+
+# Noms des mois en français (index 0 = janvier)
+_MONTHS_FR = (
+    "Janvier", "Février", "Mars", "Avril", "Mai", "Juin",
+    "Juillet", "Août", "Septembre", "Octobre", "Novembre", "Décembre"
+)
+_MONTHS_FR_SHORT = (
+    "Jan", "Fév", "Mar", "Avr", "Mai", "Juin",
+    "Juil", "Août", "Sep", "Oct", "Nov", "Déc"
+)
+
+# Échappement HTML des textes libres insérés dans l'email
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+
+# Balises conservées dans les descriptions (texte enrichi de Google Agenda) ;
+# toute autre balise est affichée échappée
+_DESCRIPTION_TAGS = frozenset({'a', 'b', 'br', 'i', 'li', 'ul'})
+_LINK_SCHEMES = ('http://', 'https://', 'mailto:')
+
+# Couleurs d'événement (rotation déterminée par le titre)
+_EVENT_COLORS = ('#ff6b6b', '#feca57', '#48dbfb', '#ff9ff3', '#54a0ff')
+
+
+# Liens "ajouter à mon calendrier" ({title}, {description} et {location} sont
+# déjà encodés pour l'URL ; {start} et {end} au format iCal)
+_CALENDAR_URL_TEMPLATES = {
+    'google': (
+        "https://calendar.google.com/calendar/render?action=TEMPLATE"
+        "&text={title}&dates={start}/{end}&details={description}&location={location}"
+    ),
+    'outlook': (
+        "https://outlook.live.com/calendar/0/deeplink/compose?"
+        "subject={title}&startdt={start}&enddt={end}&body={description}"
+        "&location={location}&path=/calendar/action/compose&rru=addevent"
+    ),
+    'yahoo': (
+        "https://calendar.yahoo.com/?v=60"
+        "&title={title}&st={start}&et={end}&desc={description}&in_loc={location}"
+    ),
+}
+
+# Repérage rapide des événements dans le flux iCal brut (voir _fast_scan)
+_VEVENT_RE = re.compile(rb'BEGIN:VEVENT\r?\n.*?END:VEVENT\r?\n', re.DOTALL)
+_DTSTART_DAY_RE = re.compile(rb'^DTSTART[^:\r\n]*:(\d{8})', re.MULTILINE)
+
+# Icônes selon le type d'événement (basé sur des mots-clés du titre)
+_ICON_RE = re.compile(
+    r'(repas|déjeuner|dîner|randonn|marche|balade|jardin|potager|sortie|visite|réunion|assemblée)',
+    re.IGNORECASE,
+)
+_ICON_MAP = {
+    'repas': '🍽️',
+    'déjeuner': '🍽️',
+    'dîner': '🍽️',
+    'randonn': '🥾',
+    'marche': '🥾',
+    'balade': '🥾',
+    'jardin': '🌱',
+    'potager': '🌱',
+    'sortie': '🚌',
+    'visite': '🚌',
+    'réunion': '📋',
+    'assemblée': '📋',
+}
+
+
+class _DescriptionSanitizer(HTMLParser):
+    """
+    Réécrit une description en ne gardant que les balises autorisées.
+
+    Les balises de ``_DESCRIPTION_TAGS`` sont réémises sans attribut (sauf le
+    ``href`` http, https ou mailto des liens), les autres sont échappées avec
+    le texte. Les balises restées ouvertes sont refermées à la fin pour ne
+    pas déborder sur le reste de l'email.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.open_tags: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[tuple]) -> None:
+        if tag not in _DESCRIPTION_TAGS:
+            self.handle_data(self.get_starttag_text())
+        elif tag == 'br':
+            self.parts.append('<br>')
+        else:
+            href = (dict(attrs).get('href') or '') if tag == 'a' else ''
+            if href.strip().lower().startswith(_LINK_SCHEMES):
+                self.parts.append(f'<a href="{href.translate(_HTML_ESCAPE)}">')
+            else:
+                self.parts.append(f'<{tag}>')
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: List[tuple]) -> None:
+        if tag == 'br':
+            self.parts.append('<br>')
+        else:
+            self.handle_data(self.get_starttag_text())
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag not in _DESCRIPTION_TAGS:
+            self.handle_data(f'</{tag}>')
+        elif tag in self.open_tags:
+            while self.open_tags:
+                closed = self.open_tags.pop()
+                self.parts.append(f'</{closed}>')
+                if closed == tag:
+                    break
+
+    def handle_data(self, data: str) -> None:
+        self.parts.append(data.translate(_HTML_ESCAPE))
+
+    def handle_comment(self, data: str) -> None:
+        self.handle_data(f'<!--{data}-->')
+
+    def handle_decl(self, decl: str) -> None:
+        self.handle_data(f'<!{decl}>')
+
+    def handle_pi(self, data: str) -> None:
+        self.handle_data(f'<?{data}>')
+
+    def unknown_decl(self, data: str) -> None:
+        self.handle_data(f'<![{data}]>')
+
+    def result(self) -> str:
+        self.close()
+        return ''.join(self.parts + [f'</{tag}>' for tag in reversed(self.open_tags)])
+
+
+def _sanitize_description(description: str) -> str:
+    """Convertit une description en HTML sûr (voir _DescriptionSanitizer)."""
+    sanitizer = _DescriptionSanitizer()
+    sanitizer.feed(description)
+    return sanitizer.result()
+
+
+@lru_cache(maxsize=256)
+def _pick_color_icon(title: str) -> tuple[str, str]:
+    """
+    Choisit la couleur et l'icône d'un événement à partir de son titre.
+
+    Le CRC32 du titre donne une couleur stable d'un lancement à l'autre
+    (contrairement à ``hash()``), et le résultat est mémorisé car les mêmes
+    titres reviennent souvent. L'icône correspond au premier mot-clé trouvé
+    dans le titre.
+
+    Args:
+        title: Titre de l'événement
+
+    Returns:
+        Tuple (couleur, icône)
+    """
+    color = _EVENT_COLORS[zlib.crc32(title.encode('utf-8')) % len(_EVENT_COLORS)]
+
+    match = _ICON_RE.search(title)
+    icon = _ICON_MAP[match.group(1).lower()] if match else '🎉'
+
+    return color, icon
 
 
 class CalendarFetcher:
     """Récupère les événements d'un calendrier Google via iCal."""
 
-    def __init__(self, calendar_id: str, timezone: str = "Europe/Paris"):
+    _session: ClassVar[requests.Session] = _build_session()
+
+    def __init__(
+        self,
+        calendar_id: str,
+        timezone: str | tzinfo | None = None,
+        cache_dir: Path | None = None,
+        ttl_seconds: int = 3600,
+    ):
         """
         Initialise le fetcher de calendrier.
 
         Args:
             calendar_id: ID du calendrier Google (ex: happy.rouret@gmail.com)
-            timezone: Fuseau horaire pour les événements
+            timezone: Fuseau horaire pour les événements, nom ou objet tzinfo
+                (par défaut Europe/Paris)
+            cache_dir: Répertoire du cache disque du flux iCal (désactivé si None)
+            ttl_seconds: Durée pendant laquelle le cache est utilisé sans
+                interroger le serveur
         """
         self.calendar_id = calendar_id
-        self.timezone = pytz.timezone(timezone)
+        self.timezone = _resolve_timezone(timezone)
+        # Fuseau à décalage fixe utilisé quand la période ne traverse pas de
+        # changement d'heure (voir _select_window_timezone), et période sur
+        # laquelle ce décalage a été vérifié
+        self._window_tz = self.timezone
+        self._window_range = None
         self.ical_url = f"https://calendar.google.com/calendar/ical/{calendar_id}/public/basic.ics"
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.ttl_seconds = ttl_seconds
 
     def fetch_events(self, days_ahead: int = 30) -> List[Dict[str, Any]]:
         """
@@ -34,17 +285,23 @@ class CalendarFetcher:
             Liste des événements avec leurs détails
         """
         try:
-            response = requests.get(self.ical_url, timeout=10)
-            response.raise_for_status()
-
-            cal = Calendar.from_ical(response.content)
-            events = []
-
             now = datetime.now(self.timezone)
             end_date = now + timedelta(days=days_ahead)
 
+            # Bornes en jours calendaires, élargies d'un jour pour couvrir
+            # n'importe quel décalage horaire de l'événement
+            first_day = now.date() - timedelta(days=1)
+            last_day = end_date.date() + timedelta(days=1)
+            self._set_window(now - timedelta(days=1), end_date + timedelta(days=1))
+
+            ical_data = self._fast_scan(self._download_ical(), first_day, last_day)
+            cal = Calendar.from_ical(ical_data)
+            events = []
+
             for component in cal.walk():
                 if component.name == "VEVENT":
+                    if self._is_outside_window(component, first_day, last_day):
+                        continue
                     event = self._parse_event(component, now, end_date)
                     if event:
                         events.append(event)
@@ -59,6 +316,240 @@ class CalendarFetcher:
         except Exception as e:
             raise Exception(f"Erreur lors du parsing du calendrier : {e}")
 
+    @classmethod
+    def fetch_events_many(
+        cls,
+        calendar_ids: List[str],
+        days_ahead: int = 30,
+        max_workers: int = 4,
+        **kwargs: Any,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Récupère les événements de plusieurs calendriers en parallèle.
+
+        Les téléchargements sont lancés simultanément sur la session partagée :
+        la durée totale est celle du flux le plus lent plutôt que la somme.
+
+        Args:
+            calendar_ids: IDs des calendriers Google
+            days_ahead: Nombre de jours à récupérer à partir d'aujourd'hui
+            max_workers: Nombre maximum de téléchargements simultanés
+            **kwargs: Options transmises au constructeur de chaque fetcher
+
+        Returns:
+            Dictionnaire {calendar_id: liste des événements}
+        """
+        if not calendar_ids:
+            return {}
+
+        fetchers = [cls(calendar_id, **kwargs) for calendar_id in calendar_ids]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(fetchers))) as executor:
+            results = executor.map(lambda fetcher: fetcher.fetch_events(days_ahead), fetchers)
+            return dict(zip(calendar_ids, results))
+
+    def _download_ical(self) -> bytes:
+        """
+        Télécharge le flux iCal en s'appuyant sur le cache disque si configuré.
+
+        Le cache est réutilisé tel quel pendant ``ttl_seconds``, puis revalidé
+        avec une requête conditionnelle (ETag / Last-Modified) : un 304 évite
+        de retélécharger le flux.
+
+        Returns:
+            Contenu brut du flux iCal
+        """
+        meta = self._load_cache_meta()
+        cached_body = self._load_cached_body() if meta is not None else None
+
+        if cached_body is not None and time.time() - meta['mtime'] < self.ttl_seconds:
+            return cached_body
+
+        headers = {}
+        if cached_body is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = self._session.get(self.ical_url, headers=headers, timeout=(3.05, 10))
+
+        if response.status_code == 304 and cached_body is not None:
+            meta['mtime'] = time.time()
+            self._store_cache(meta)
+            return cached_body
+
+        response.raise_for_status()
+
+        self._store_cache(
+            {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'mtime': time.time(),
+            },
+            response.content,
+        )
+        return response.content
+
+    def _cache_file(self, suffix: str) -> Path:
+        """Retourne le chemin d'un fichier de cache propre à ce calendrier."""
+        return self.cache_dir / f"{quote(self.calendar_id, safe='')}{suffix}"
+
+    def _load_cache_meta(self) -> Dict[str, Any] | None:
+        """Charge les métadonnées du cache, ou None si absentes ou invalides."""
+        if self.cache_dir is None:
+            return None
+        try:
+            meta = json.loads(self._cache_file('.json').read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict):
+            return None
+        mtime = meta.get('mtime')
+        if isinstance(mtime, bool) or not isinstance(mtime, (int, float)):
+            return None
+        return meta
+
+    def _load_cached_body(self) -> bytes | None:
+        """Charge le flux iCal en cache, ou None s'il est absent."""
+        try:
+            return self._cache_file('.ics').read_bytes()
+        except OSError:
+            return None
+
+    def _store_cache(self, meta: Dict[str, Any], body: bytes | None = None) -> None:
+        """
+        Enregistre le cache sur disque.
+
+        Une erreur d'écriture n'empêche pas l'envoi : le cache est seulement
+        ignoré au prochain lancement.
+        """
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if body is not None:
+                write_atomic(self._cache_file('.ics'), body)
+            write_atomic(
+                self._cache_file('.json'),
+                json.dumps(meta, separators=(',', ':')).encode('utf-8'),
+            )
+        except OSError as e:
+            logger.warning(f"Cache du calendrier non enregistré : {e}")
+
+    @staticmethod
+    def _fast_scan(ical_data: bytes, first_day: date, last_day: date) -> bytes:
+        """
+        Retire du flux iCal brut les événements clairement hors période.
+
+        Les blocs VEVENT sont repérés par expression régulière et seule la
+        date de leur ligne DTSTART est lue : icalendar n'analyse ensuite que
+        les quelques événements utiles au lieu de tout l'historique. Un bloc
+        dont la date n'est pas lisible ainsi est conservé.
+
+        Args:
+            ical_data: Contenu brut du flux iCal
+            first_day: Premier jour (date) à conserver
+            last_day: Dernier jour (date) à conserver
+
+        Returns:
+            Flux iCal réduit, toujours valide (en-tête et fuseaux conservés)
+        """
+        first = first_day.strftime('%Y%m%d').encode()
+        last = last_day.strftime('%Y%m%d').encode()
+
+        parts = []
+        position = 0
+        for block in _VEVENT_RE.finditer(ical_data):
+            # Conserver tout ce qui se trouve entre deux événements
+            parts.append(ical_data[position:block.start()])
+            position = block.end()
+
+            dtstart = _DTSTART_DAY_RE.search(ical_data, block.start(), block.end())
+            if dtstart is None or first <= dtstart.group(1) <= last:
+                parts.append(block.group())
+
+        if not parts:
+            return ical_data
+
+        parts.append(ical_data[position:])
+        return b''.join(parts)
+
+    @staticmethod
+    def _is_outside_window(event_component: Any, first_day: date, last_day: date) -> bool:
+        """
+        Écarte rapidement un événement dont la date est hors période.
+
+        La comparaison se fait sur la date brute de DTSTART, sans conversion de
+        fuseau horaire : l'historique du calendrier est ainsi ignoré avant
+        tout calcul coûteux. Les cas limites sont laissés à ``_parse_event``.
+
+        Args:
+            event_component: Composant VEVENT de l'événement
+            first_day: Premier jour (date) à conserver
+            last_day: Dernier jour (date) à conserver
+
+        Returns:
+            True si l'événement est certainement hors période
+        """
+        dtstart = event_component.get('dtstart')
+        if dtstart is None:
+            return False
+
+        start = dtstart.dt
+        start_day = start.date() if isinstance(start, datetime) else start
+        return start_day < first_day or start_day > last_day
+
+    def _select_window_timezone(self, start: datetime, end: datetime) -> tzinfo:
+        """
+        Choisit le fuseau utilisé pour convertir les événements d'une période.
+
+        Si le décalage UTC ne change pas sur toute la période, un fuseau à
+        décalage fixe (``datetime.timezone``) évite la recherche dans la table
+        des transitions pour chaque événement. Le décalage est relevé jour par
+        jour : comparer seulement les deux extrémités ne suffit pas, une
+        période de plus de quelques mois pouvant traverser deux changements
+        d'heure. Sinon le fuseau complet est conservé.
+
+        Args:
+            start: Début de la période
+            end: Fin de la période
+
+        Returns:
+            Fuseau à utiliser pour les événements de la période
+        """
+        offset = start.astimezone(self.timezone).utcoffset()
+        moment = start
+        while moment < end:
+            moment = min(moment + timedelta(days=1), end)
+            if moment.astimezone(self.timezone).utcoffset() != offset:
+                return self.timezone
+        return timezone(offset)
+
+    def _set_window(self, start: datetime, end: datetime) -> None:
+        """Fixe la période des événements et le fuseau associé."""
+        self._window_tz = self._select_window_timezone(start, end)
+        self._window_range = (start, end)
+
+    def _to_local(self, dt: datetime) -> datetime:
+        """
+        Convertit un datetime (naïf ou non) dans le fuseau de la période.
+
+        Le décalage fixe n'est appliqué qu'aux instants de la période vérifiée :
+        la fin d'un événement de plusieurs jours peut tomber après un
+        changement d'heure et passe alors par le fuseau complet.
+        """
+        if self._window_tz is not self.timezone:
+            if dt.tzinfo is None:
+                local = dt.replace(tzinfo=self._window_tz)
+            else:
+                local = dt.astimezone(self._window_tz)
+            start, end = self._window_range
+            if start <= local <= end:
+                return local
+        if dt.tzinfo is None:
+            return _localize(self.timezone, dt)
+        return dt.astimezone(self.timezone)
+
     def _parse_event(
         self,
         event_component: Any,
@@ -81,15 +572,10 @@ class CalendarFetcher:
 
             # Gérer les événements "all-day" (date seulement, pas datetime)
             if isinstance(start_dt, datetime):
-                if start_dt.tzinfo is None:
-                    start_dt = self.timezone.localize(start_dt)
-                else:
-                    start_dt = start_dt.astimezone(self.timezone)
+                start_dt = self._to_local(start_dt)
             else:
                 # Pour les événements "all-day", créer un datetime à minuit
-                start_dt = self.timezone.localize(
-                    datetime.combine(start_dt, datetime.min.time())
-                )
+                start_dt = self._to_local(datetime.combine(start_dt, datetime.min.time()))
 
             # Filtrer les événements hors de la période
             if start_dt < start_filter or start_dt > end_filter:
@@ -100,10 +586,7 @@ class CalendarFetcher:
             if end_dt:
                 end_dt = end_dt.dt
                 if isinstance(end_dt, datetime):
-                    if end_dt.tzinfo is None:
-                        end_dt = self.timezone.localize(end_dt)
-                    else:
-                        end_dt = end_dt.astimezone(self.timezone)
+                    end_dt = self._to_local(end_dt)
 
             # Extraire les informations
             summary = str(event_component.get('summary', 'Sans titre'))
@@ -120,9 +603,21 @@ class CalendarFetcher:
             }
 
         except Exception as e:
-            print(f"Erreur lors du parsing d'un événement : {e}")
+            logger.warning(f"Erreur lors du parsing d'un événement : {e}")
             return None
 
+    def format_events_for_email(self, events: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        Formate une liste d'événements pour l'affichage dans l'email.
+
+        Args:
+            events: Événements à formater, dans l'ordre d'affichage
+
+        Returns:
+            Liste des dictionnaires formatés pour le template
+        """
+        return list(map(self.format_event_for_email, events))
+
     def format_event_for_email(self, event: Dict[str, Any]) -> Dict[str, str]:
         """
         Formate un événement pour l'affichage dans l'email.
@@ -134,50 +629,93 @@ class CalendarFetcher:
             Dictionnaire avec les champs formatés pour le template
         """
         start_dt = event['start_datetime']
+        end_dt = event['end_datetime']
+
+        # Le fuseau fait partie de la clé : deux datetimes au même instant
+        # mais dans des fuseaux différents ne s'affichent pas pareil
+        return dict(self._format_event_fields(
+            event['title'],
+            event['description'],
+            event['location'],
+            start_dt,
+            start_dt.tzinfo,
+            end_dt,
+            getattr(end_dt, 'tzinfo', None),
+            event['is_all_day'],
+        ))
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _format_event_fields(
+        title: str,
+        description: str,
+        location: str,
+        start_dt: datetime,
+        start_tz: Any,
+        end_dt: Any,
+        end_tz: Any,
+        is_all_day: bool,
+    ) -> Dict[str, str]:
+        """
+        Calcule les champs formatés d'un événement, mémorisés par événement.
+
+        Un même événement formaté plusieurs fois (par exemple pour générer
+        l'email avec plusieurs templates) n'est ainsi calculé qu'une fois.
+        Le dictionnaire retourné est partagé : format_event_for_email en
+        renvoie une copie. Le titre et le lieu sont échappés pour le HTML, la
+        description ne garde que les balises de mise en forme simples ; les
+        liens calendrier utilisent les valeurs brutes.
+
+        Args:
+            title: Titre de l'événement
+            description: Description brute
+            location: Lieu de l'événement
+            start_dt: Début de l'événement
+            start_tz: Fuseau de start_dt (clé de cache uniquement)
+            end_dt: Fin de l'événement, ou None
+            end_tz: Fuseau de end_dt (clé de cache uniquement)
+            is_all_day: Événement sur la journée entière
+
+        Returns:
+            Dictionnaire avec les champs formatés pour le template
+        """
+        day, start_time = start_dt.strftime('%d|%H:%M').split('|')
 
         # Déterminer le format d'heure
-        if event['is_all_day']:
+        if is_all_day:
             time_str = "Toute la journée"
-        elif event['end_datetime']:
-            time_str = f"{start_dt.strftime('%H:%M')} - {event['end_datetime'].strftime('%H:%M')}"
+        elif end_dt:
+            time_str = f"{start_time} - {end_dt.strftime('%H:%M')}"
         else:
-            time_str = start_dt.strftime('%H:%M')
+            time_str = start_time
 
         # Formater la description si présente
         description_html = ""
-        if event['description'] and event['description'].strip():
-            description_html = f'<p style="color: #777; font-size: 14px; margin: 8px 0 0 0; line-height: 1.5;">{event["description"]}</p>'
-
-        # Choisir une couleur d'événement (rotation entre plusieurs couleurs)
-        colors = ['#ff6b6b', '#feca57', '#48dbfb', '#ff9ff3', '#54a0ff']
-        color_index = hash(event['title']) % len(colors)
-
-        # Choisir une icône selon le type d'événement (basé sur des mots-clés)
-        icon = '🎉'
-        title_lower = event['title'].lower()
-        if 'repas' in title_lower or 'déjeuner' in title_lower or 'dîner' in title_lower:
-            icon = '🍽️'
-        elif 'randonn' in title_lower or 'marche' in title_lower or 'balade' in title_lower:
-            icon = '🥾'
-        elif 'jardin' in title_lower or 'potager' in title_lower:
-            icon = '🌱'
-        elif 'sortie' in title_lower or 'visite' in title_lower:
-            icon = '🚌'
-        elif 'réunion' in title_lower or 'assemblée' in title_lower:
-            icon = '📋'
+        if description and not description.isspace():
+            description_html = f'<p style="color: #777; font-size: 14px; margin: 8px 0 0 0; line-height: 1.5;">{_sanitize_description(description)}</p>'
+
+        # Choisir une couleur et une icône selon le titre de l'événement
+        event_color, icon = _pick_color_icon(title)
 
         # Générer les liens pour ajouter au calendrier
-        calendar_links = self._generate_calendar_links(event)
+        calendar_links = CalendarFetcher._generate_calendar_links({
+            'title': title,
+            'description': description,
+            'location': location,
+            'start_datetime': start_dt,
+            'end_datetime': end_dt,
+            'is_all_day': is_all_day,
+        })
 
         return {
-            'day': start_dt.strftime('%d'),
-            'month': self._get_french_month(start_dt.month),
-            'month_short': self._get_french_month_short(start_dt.month),
+            'day': day,
+            'month': _MONTHS_FR[start_dt.month - 1],
+            'month_short': _MONTHS_FR_SHORT[start_dt.month - 1],
             'time': time_str,
-            'title': event['title'],
-            'location': event['location'],
+            'title': title.translate(_HTML_ESCAPE),
+            'location': location.translate(_HTML_ESCAPE),
             'description': description_html,
-            'event_color': colors[color_index],
+            'event_color': event_color,
             'icon': icon,
             'add_to_google': calendar_links['google'],
             'add_to_outlook': calendar_links['outlook'],
@@ -185,24 +723,6 @@ class CalendarFetcher:
             'add_to_ical': calendar_links['ical']
         }
 
-    @staticmethod
-    def _get_french_month(month_num: int) -> str:
-        """Retourne le nom du mois en français."""
-        months = [
-            "Janvier", "Février", "Mars", "Avril", "Mai", "Juin",
-            "Juillet", "Août", "Septembre", "Octobre", "Novembre", "Décembre"
-        ]
-        return months[month_num - 1]
-
-    @staticmethod
-    def _get_french_month_short(month_num: int) -> str:
-        """Retourne le nom court du mois en français."""
-        months = [
-            "Jan", "Fév", "Mar", "Avr", "Mai", "Juin",
-            "Juil", "Août", "Sep", "Oct", "Nov", "Déc"
-        ]
-        return months[month_num - 1]
-
     @staticmethod
     def _generate_calendar_links(event: Dict[str, Any]) -> Dict[str, str]:
         """
@@ -231,55 +751,25 @@ class CalendarFetcher:
             end_str = end_dt.strftime('%Y%m%d')
         else:
             # Convertir en UTC pour les liens calendrier
-            start_utc = start_dt.astimezone(pytz.UTC)
-            end_utc = end_dt.astimezone(pytz.UTC)
+            start_utc = start_dt.astimezone(timezone.utc)
+            end_utc = end_dt.astimezone(timezone.utc)
             start_str = start_utc.strftime('%Y%m%dT%H%M%SZ')
             end_str = end_utc.strftime('%Y%m%dT%H%M%SZ')
 
-        # Encoder les paramètres
-        title = quote(event['title'])
-        description = quote(event.get('description', ''))
-        location = quote(event.get('location', ''))
-
-        # Google Calendar
-        google_url = (
-            f"https://calendar.google.com/calendar/render?"
-            f"action=TEMPLATE"
-            f"&text={title}"
-            f"&dates={start_str}/{end_str}"
-            f"&details={description}"
-            f"&location={location}"
-        )
-
-        # Outlook.com / Office 365
-        outlook_url = (
-            f"https://outlook.live.com/calendar/0/deeplink/compose?"
-            f"subject={title}"
-            f"&startdt={start_str}"
-            f"&enddt={end_str}"
-            f"&body={description}"
-            f"&location={location}"
-            f"&path=/calendar/action/compose"
-            f"&rru=addevent"
-        )
-
-        # Yahoo Calendar
-        yahoo_url = (
-            f"https://calendar.yahoo.com/?"
-            f"v=60"
-            f"&title={title}"
-            f"&st={start_str}"
-            f"&et={end_str}"
-            f"&desc={description}"
-            f"&in_loc={location}"
-        )
+        # Encoder les paramètres une seule fois pour tous les liens
+        fields = {
+            'title': quote(event['title'], safe=''),
+            'description': quote(event.get('description', ''), safe=''),
+            'location': quote(event.get('location', ''), safe=''),
+            'start': start_str,
+            'end': end_str,
+        }
+        links = {
+            name: template.format_map(fields)
+            for name, template in _CALENDAR_URL_TEMPLATES.items()
+        }
 
         # Lien iCal/ICS universel (on génère un lien Google qui peut être utilisé par tous)
-        ical_url = google_url
+        links['ical'] = links['google']
 
-        return {
-            'google': google_url,
-            'outlook': outlook_url,
-            'yahoo': yahoo_url,
-            'ical': ical_url
-        }
+        return links
@@ -6,6 +6,11 @@ from typing import List, Dict
 import re
 
 
+# Marqueurs délimitant le bloc répété pour chaque événement
+_EVENT_LOOP_START = '<!-- EVENT_LOOP_START -->'
+_EVENT_LOOP_END = '<!-- EVENT_LOOP_END -->'
+
+
 class EmailGenerator:
     """Génère des emails HTML à partir de templates."""
 
@@ -23,6 +28,16 @@ class EmailGenerator:
         if not self.template_path.exists():
             raise FileNotFoundError(f"Template non trouvé : {self.template_path}")
 
+        # Charger et découper le template une seule fois : generate() ne fait
+        # ensuite plus que de l'assemblage en mémoire
+        template_html = self.template_path.read_text(encoding='utf-8')
+        self._template_html = template_html
+        self._event_template = self._extract_event_template(template_html)
+        self._event_parts = self._compile_template(self._event_template)
+        section = self._partition_events_section(template_html)
+        self._events_section = (section[0], section[2]) if section else None
+        self._recap_template = self._extract_recap_template(template_html)
+
     def generate(
         self,
         events: List[Dict[str, str]],
@@ -38,44 +53,36 @@ class EmailGenerator:
         Returns:
             HTML complet de l'email
         """
-        # Charger le template
-        template_html = self.template_path.read_text(encoding='utf-8')
-
-        # Générer le HTML des événements
-        events_html = self._generate_events_html(template_html, events)
-        recap_html = self._generate_recap_html(template_html, recap_items or [])
-
-        # Remplacer les sections dynamiques dans le template
-        final_html = self._replace_events_section(template_html, events_html)
+        # Insérer le HTML des événements entre les parties fixes du template
+        if self._events_section is None:
+            final_html = self._template_html
+        else:
+            before_events, after_events = self._events_section
+            final_html = "".join(
+                (before_events, self._generate_events_html(events), after_events)
+            )
+
+        # Remplacer la section des contenus récents
+        recap_html = self._generate_recap_html(recap_items or [])
         final_html = self._replace_recap_section(final_html, recap_html)
 
         return final_html
 
-    def _generate_events_html(self, template: str, events: List[Dict[str, str]]) -> str:
+    def _generate_events_html(self, events: List[Dict[str, str]]) -> str:
         """
         Génère le HTML pour tous les événements.
 
         Args:
-            template: Le template HTML complet
             events: Liste des événements formatés
 
         Returns:
             HTML de tous les événements
         """
-        # Extraire le template d'un seul événement
-        event_template = self._extract_event_template(template)
-
-        if not event_template:
+        if not self._event_template:
             return "<p>Erreur : template d'événement non trouvé</p>"
 
-        # Générer le HTML pour chaque événement
-        events_html_parts = []
-        for event in events:
-            event_html = self._fill_event_template(event_template, event)
-            events_html_parts.append(event_html)
-
-        # Joindre avec un saut de ligne
-        return "\n".join(events_html_parts)
+        # Générer le HTML pour chaque événement, joint avec un saut de ligne
+        return "\n".join(self._fill_event_template(event) for event in events)
 
     def _extract_event_template(self, template: str) -> str:
         """
@@ -87,70 +94,60 @@ class EmailGenerator:
         Returns:
             Template HTML d'un seul événement
         """
-        # Chercher le contenu entre <!-- EVENT_LOOP_START --> et <!-- EVENT_LOOP_END -->
-        pattern = r'<!-- EVENT_LOOP_START -->\n?(.*?)\n?<!-- EVENT_LOOP_END -->'
-        match = re.search(pattern, template, re.DOTALL)
-
-        if match:
-            # Ne pas strip complètement pour préserver l'indentation relative
-            content = match.group(1)
-            # Supprimer seulement les lignes vides au début et à la fin
-            lines = content.split('\n')
-            # Trouver la première et dernière ligne non vide
-            start_idx = 0
-            end_idx = len(lines) - 1
-            while start_idx < len(lines) and not lines[start_idx].strip():
-                start_idx += 1
-            while end_idx >= 0 and not lines[end_idx].strip():
-                end_idx -= 1
-            if start_idx <= end_idx:
-                return '\n'.join(lines[start_idx:end_idx + 1])
+        section = self._partition_events_section(template)
+        if section is None:
             return ""
 
+        # Ne pas strip complètement pour préserver l'indentation relative :
+        # supprimer seulement les lignes vides au début et à la fin
+        lines = section[1].split('\n')
+        # Trouver la première et dernière ligne non vide
+        start_idx = 0
+        end_idx = len(lines) - 1
+        while start_idx < len(lines) and not lines[start_idx].strip():
+            start_idx += 1
+        while end_idx >= 0 and not lines[end_idx].strip():
+            end_idx -= 1
+        if start_idx <= end_idx:
+            return '\n'.join(lines[start_idx:end_idx + 1])
         return ""
 
-    def _replace_events_section(self, template: str, events_html: str) -> str:
+    @staticmethod
+    def _partition_events_section(template: str) -> tuple[str, str, str] | None:
         """
-        Remplace la section des événements dans le template.
+        Découpe le template autour de la section des événements.
+
+        Les marqueurs étant littéraux, un simple ``str.partition`` suffit.
 
         Args:
             template: Template HTML complet
-            events_html: HTML généré pour tous les événements
 
         Returns:
-            Template avec les événements insérés
+            Tuple (HTML avant la section, contenu de la section, HTML après la
+            section), ou None si le template ne contient pas de section
         """
-        # Remplacer tout le contenu entre les marqueurs
-        pattern = r'<!-- EVENT_LOOP_START -->.*?<!-- EVENT_LOOP_END -->'
-        result = re.sub(pattern, events_html, template, flags=re.DOTALL)
-
-        return result
+        before, start, rest = template.partition(_EVENT_LOOP_START)
+        content, end, after = rest.partition(_EVENT_LOOP_END)
+        if not start or not end:
+            return None
+        return before, content, after
 
-    def _generate_recap_html(
-        self,
-        template: str,
-        recap_items: List[Dict[str, str]],
-    ) -> str:
+    def _generate_recap_html(self, recap_items: List[Dict[str, str]]) -> str:
         """
         Génère le HTML pour les contenus récents du site.
 
         Args:
-            template: Le template HTML complet
             recap_items: Liste des contenus récents formatés
 
         Returns:
             HTML de tous les contenus récents, ou chaîne vide si aucun contenu
         """
-        if not recap_items:
-            return ""
-
-        recap_template = self._extract_recap_template(template)
-        if not recap_template:
+        if not recap_items or not self._recap_template:
             return ""
 
         recap_html_parts = []
         for item in recap_items:
-            recap_html_parts.append(self._fill_recap_template(recap_template, item))
+            recap_html_parts.append(self._fill_recap_template(self._recap_template, item))
 
         return "\n".join(recap_html_parts)
 
@@ -194,25 +191,44 @@ class EmailGenerator:
             result = result.replace(f"{{{key}}}", escaped_value)
         return result
 
-    def _fill_event_template(self, event_template: str, event: Dict[str, str]) -> str:
+    @staticmethod
+    def _compile_template(template: str) -> tuple[List[str], List[str]]:
+        """
+        Découpe un template en textes fixes et noms de variables.
+
+        Args:
+            template: Template HTML contenant des variables {variable_name}
+
+        Returns:
+            Tuple (textes fixes, noms de variables), avec un texte fixe de plus
+            que de variables : ils s'intercalent dans cet ordre
+        """
+        parts = re.split(r'\{(\w+)\}', template)
+        return parts[::2], parts[1::2]
+
+    def _fill_event_template(self, event: Dict[str, str]) -> str:
         """
         Remplit le template d'un événement avec ses données.
 
+        Le template est parcouru une seule fois grâce au découpage préparé
+        dans __init__ ; une variable absente de l'événement est laissée telle
+        quelle.
+
         Args:
-            event_template: Template HTML d'un événement
             event: Données de l'événement
 
         Returns:
             HTML de l'événement rempli
         """
-        result = event_template
+        literals, keys = self._event_parts
+        result = [literals[0]]
+        append = result.append
 
-        # Remplacer toutes les variables {variable_name}
-        for key, value in event.items():
-            placeholder = f"{{{key}}}"
-            result = result.replace(placeholder, str(value))
+        for key, literal in zip(keys, literals[1:]):
+            append(str(event[key]) if key in event else f"{{{key}}}")
+            append(literal)
 
-        return result
+        return "".join(result)
 
     @staticmethod
     def get_available_templates() -> List[str]:
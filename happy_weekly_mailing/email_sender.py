@@ -1,21 +1,81 @@
 """Module pour envoyer des emails via SMTP."""
 
+import copy
+import io
+import logging
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.generator import BytesGenerator
+from email.message import EmailMessage
+from email.utils import getaddresses
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# Rattaché au logger du script (voir main._setup_logging)
+logger = logging.getLogger('happy.email_sender')
+
+
+class _PinnedAddressMixin:
+    """
+    Connecte la socket à une adresse IP déjà résolue.
+
+    Le nom d'hôte reste celui passé au constructeur : TLS (SNI et
+    vérification du certificat) l'utilise toujours.
+    """
+
+    def __init__(self, *args, pinned_address: str | None = None, **kwargs):
+        # Défini avant super().__init__, qui ouvre la connexion
+        self._pinned_address = pinned_address
+        super().__init__(*args, **kwargs)
+
+    def _get_socket(self, host, port, timeout):
+        return super()._get_socket(self._pinned_address or host, port, timeout)
+
+
+class _PinnedSMTP(_PinnedAddressMixin, smtplib.SMTP):
+    """smtplib.SMTP connecté à une adresse IP fixée."""
+
+
+class _PinnedSMTP_SSL(_PinnedAddressMixin, smtplib.SMTP_SSL):
+    """smtplib.SMTP_SSL connecté à une adresse IP fixée."""
 
 
 class EmailSender:
     """Envoie des emails via SMTP."""
 
+    # En dessous de ce nombre de destinataires, l'envoi individuel reste
+    # séquentiel : ouvrir plusieurs connexions coûterait plus que l'envoi
+    MIN_PARALLEL_RECIPIENTS = 5
+
+    # Une connexion est recyclée après ce nombre de messages (limite usuelle
+    # des fournisseurs SMTP par session)
+    MAX_MESSAGES_PER_CONNECTION = 100
+
+    # Une connexion utilisée il y a moins de ce délai (secondes) est réutilisée
+    # sans NOOP préalable : une coupure est alors détectée à l'envoi lui-même
+    # (voir _send), ce qui économise un aller-retour par message
+    NOOP_AFTER_IDLE_SECONDS = 5
+
+    # Codes SMTP temporaires pour lesquels l'envoi est retenté, et délais
+    # d'attente successifs en secondes
+    TRANSIENT_SMTP_CODES = frozenset({421, 450, 451, 452})
+    RETRY_DELAYS = (1, 2, 4)
+
+    # Délai de connexion (secondes) vers l'adresse IP mise en cache : si elle
+    # ne répond pas vite, le nom d'hôte est résolu à nouveau
+    PINNED_CONNECT_TIMEOUT = 5
+
     def __init__(
         self,
         smtp_host: str,
         smtp_port: int,
         smtp_user: str,
         smtp_password: str,
-        use_tls: bool = True
+        use_tls: bool = True,
+        smtp_ip: str | None = None,
+        on_unreachable_ip: Callable[[], None] | None = None
     ):
         """
         Initialise le sender d'emails.
@@ -26,23 +86,356 @@ class EmailSender:
             smtp_user: Nom d'utilisateur SMTP
             smtp_password: Mot de passe SMTP
             use_tls: Utiliser TLS (True) ou SSL (False)
+            smtp_ip: Adresse IP déjà résolue de smtp_host (évite la
+                résolution DNS à chaque connexion)
+            on_unreachable_ip: Fonction appelée si smtp_ip ne répond pas
+                (pour invalider le cache d'où elle provient)
         """
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
         self.smtp_user = smtp_user
         self.smtp_password = smtp_password
         self.use_tls = use_tls
+        self.smtp_ip = smtp_ip
+        self.on_unreachable_ip = on_unreachable_ip
+        self._server: smtplib.SMTP | None = None
+        self._keep_open = False
+        self._sent_on_connection = 0
+        self._last_used = 0.0
+
+    def __enter__(self) -> "EmailSender":
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def open(self) -> "EmailSender":
+        """
+        Conserve la connexion SMTP entre les envois suivants.
+
+        La connexion est établie au premier envoi puis réutilisée jusqu'à
+        close(). Sans appel à open() (ou bloc ``with``), chaque envoi ouvre et
+        ferme sa propre connexion.
+
+        Returns:
+            L'instance elle-même
+        """
+        self._keep_open = True
+        return self
+
+    def close(self) -> None:
+        """Ferme la connexion SMTP persistante si elle est ouverte."""
+        self._keep_open = False
+        self._disconnect()
+
+    def _disconnect(self) -> None:
+        """Ferme la connexion SMTP courante si elle existe."""
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        finally:
+            self._server = None
+
+    @contextmanager
+    def _session(self) -> Iterator[None]:
+        """
+        Délimite une série d'envois.
+
+        Hors d'une session ouverte par open(), la connexion utilisée pendant
+        la série est fermée à la fin.
+        """
+        try:
+            yield
+        finally:
+            if not self._keep_open:
+                self._disconnect()
+
+    def _open_server(self, timeout: int = 30) -> smtplib.SMTP:
+        """
+        Ouvre une nouvelle connexion SMTP et s'authentifie.
+
+        Args:
+            timeout: Délai maximum des opérations réseau en secondes
+
+        Returns:
+            Connexion SMTP authentifiée
+        """
+        server = self._create_server(timeout)
+
+        try:
+            if self.use_tls:
+                server.starttls()
+            server.login(self.smtp_user, self.smtp_password)
+        except BaseException:
+            server.close()
+            raise
+
+        return server
+
+    def _create_server(self, timeout: int) -> smtplib.SMTP:
+        """
+        Ouvre la connexion SMTP, vers smtp_ip si l'adresse est connue.
+
+        La connexion à l'adresse IP est limitée à PINNED_CONNECT_TIMEOUT
+        secondes. Si elle échoue (entrée DNS périmée), l'adresse est oubliée,
+        on_unreachable_ip est appelée et la connexion est retentée avec le nom
+        d'hôte.
+
+        Args:
+            timeout: Délai maximum des opérations réseau en secondes
+
+        Returns:
+            Connexion SMTP non authentifiée
+        """
+        if self.smtp_ip:
+            pinned_class = _PinnedSMTP if self.use_tls else _PinnedSMTP_SSL
+            try:
+                server = pinned_class(
+                    self.smtp_host, self.smtp_port,
+                    timeout=min(timeout, self.PINNED_CONNECT_TIMEOUT),
+                    pinned_address=self.smtp_ip,
+                )
+            except OSError:
+                self.smtp_ip = None
+                if self.on_unreachable_ip is not None:
+                    self.on_unreachable_ip()
+            else:
+                # Délai normal pour la suite de la session
+                server.timeout = timeout
+                server.sock.settimeout(timeout)
+                return server
+
+        if self.use_tls:
+            # Utiliser STARTTLS (port 587)
+            return smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=timeout)
+        # Utiliser SSL (port 465)
+        return smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=timeout)
+
+    def _connect(self) -> smtplib.SMTP:
+        """
+        Retourne la connexion courante, en la rétablissant si elle est tombée
+        ou si elle a atteint MAX_MESSAGES_PER_CONNECTION messages.
+
+        L'état de la connexion n'est vérifié (NOOP) qu'après
+        NOOP_AFTER_IDLE_SECONDS d'inactivité.
+
+        Returns:
+            Connexion SMTP authentifiée
+        """
+        if self._server is not None:
+            if self._sent_on_connection >= self.MAX_MESSAGES_PER_CONNECTION:
+                self._disconnect()
+            elif time.monotonic() - self._last_used < self.NOOP_AFTER_IDLE_SECONDS:
+                return self._server
+            else:
+                try:
+                    if self._server.noop()[0] == 250:
+                        return self._server
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._disconnect()
+
+        self._server = self._open_server()
+        self._sent_on_connection = 0
+        return self._server
+
+    def _send(self, msg: EmailMessage, to_addrs: Sequence[str] | None = None) -> None:
+        """
+        Envoie un message sur la connexion courante.
+
+        Une déconnexion ou une erreur SMTP temporaire (4xx) entraîne une
+        reconnexion et un nouvel essai, avec une attente croissante.
+
+        Args:
+            msg: Message à envoyer
+            to_addrs: Destinataires de l'enveloppe (par défaut ceux des en-têtes)
+        """
+        for delay in (*self.RETRY_DELAYS, None):
+            try:
+                self._transmit(self._connect(), msg, to_addrs)
+                self._sent_on_connection += 1
+                self._last_used = time.monotonic()
+                return
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException) as e:
+                transient = (
+                    isinstance(e, smtplib.SMTPServerDisconnected)
+                    or e.smtp_code in self.TRANSIENT_SMTP_CODES
+                )
+                if delay is None or not transient:
+                    raise
+                self._disconnect()
+                time.sleep(delay)
+
+    @staticmethod
+    def _transmit(
+        server: smtplib.SMTP,
+        msg: EmailMessage,
+        to_addrs: Sequence[str] | None = None
+    ) -> Dict[str, Tuple[int, bytes]]:
+        """
+        Transmet un message, en pipelinant l'enveloppe si le serveur le permet.
+
+        Avec l'extension PIPELINING (RFC 2920), MAIL FROM et tous les RCPT TO
+        partent en une seule écriture et leurs réponses sont lues ensuite :
+        l'enveloppe coûte un aller-retour au lieu d'un par destinataire.
+        Sinon, ou pour des adresses internationales (SMTPUTF8), l'envoi
+        standard de smtplib est utilisé.
+
+        Args:
+            server: Connexion SMTP authentifiée
+            msg: Message à envoyer
+            to_addrs: Destinataires de l'enveloppe (par défaut ceux des en-têtes)
+
+        Returns:
+            Destinataires refusés, comme smtplib.SMTP.sendmail
+        """
+        from_addr = getaddresses([msg['Sender'] or msg['From']])[0][1]
+        if to_addrs is None:
+            to_addrs = [
+                address
+                for _name, address in getaddresses(
+                    msg.get_all('To', []) + msg.get_all('Cc', []) + msg.get_all('Bcc', [])
+                )
+            ]
+
+        if (
+            not server.has_extn('pipelining')
+            or not to_addrs
+            or not all(address.isascii() for address in [from_addr, *to_addrs])
+        ):
+            return server.send_message(msg, to_addrs=to_addrs)
+
+        # Même sérialisation que smtplib.SMTP.send_message
+        msg_copy = copy.copy(msg)
+        del msg_copy['Bcc']
+        del msg_copy['Resent-Bcc']
+        with io.BytesIO() as buffer:
+            BytesGenerator(buffer).flatten(msg_copy, linesep='\r\n')
+            data = buffer.getvalue()
+
+        server.ehlo_or_helo_if_needed()
+        mail_options = f" SIZE={len(data)}" if server.has_extn('size') else ""
+        commands = [f"MAIL FROM:{smtplib.quoteaddr(from_addr)}{mail_options}\r\n"]
+        commands += [f"RCPT TO:{smtplib.quoteaddr(address)}\r\n" for address in to_addrs]
+        server.send("".join(commands))
+
+        code, response = server.getreply()
+        if code != 250:
+            if code == 421:
+                server.close()
+            else:
+                for _address in to_addrs:
+                    server.getreply()
+                server.rset()
+            raise smtplib.SMTPSenderRefused(code, response, from_addr)
+
+        refused = {}
+        for address in to_addrs:
+            code, response = server.getreply()
+            if code not in (250, 251):
+                refused[address] = (code, response)
+        if len(refused) == len(to_addrs):
+            server.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        code, response = server.data(data)
+        if code != 250:
+            if code == 421:
+                server.close()
+            else:
+                server.rset()
+            raise smtplib.SMTPDataError(code, response)
+
+        return refused
+
+    def build_message(
+        self,
+        to_addresses: Sequence[str],
+        subject: str,
+        html_content: str,
+        from_address: str | None = None,
+        from_name: str = "Happy au Rouret"
+    ) -> EmailMessage:
+        """
+        Construit un email HTML prêt à être envoyé.
+
+        Le corps HTML est encodé une seule fois ici ; pour plusieurs
+        destinataires, voir _with_recipient qui ne change que l'en-tête To:.
+
+        Args:
+            to_addresses: Adresses de l'en-tête To: (aucun en-tête si vide)
+            subject: Sujet de l'email
+            html_content: Contenu HTML de l'email
+            from_address: Adresse email de l'expéditeur (par défaut: smtp_user)
+            from_name: Nom de l'expéditeur
+
+        Returns:
+            Message MIME
+        """
+        from_address = from_address or self.smtp_user
+
+        msg = EmailMessage()
+        msg['Subject'] = subject
+        msg['From'] = f"{from_name} <{from_address}>"
+        if to_addresses:
+            msg['To'] = ', '.join(to_addresses)
+
+        # Ajouter le contenu HTML
+        msg.set_content(html_content, subtype='html', charset='utf-8')
+
+        return msg
+
+    @staticmethod
+    def _with_recipient(base: EmailMessage, address: str) -> EmailMessage:
+        """
+        Copie un message déjà encodé en ne changeant que son destinataire.
+
+        Args:
+            base: Message sans en-tête To:
+            address: Adresse du destinataire
+
+        Returns:
+            Copie du message adressée à ``address``
+        """
+        msg = copy.deepcopy(base)
+        msg['To'] = address
+        return msg
+
+    def send_bulk(self, messages: Iterable[EmailMessage]) -> int:
+        """
+        Envoie plusieurs messages sur une même connexion SMTP.
+
+        Args:
+            messages: Messages à envoyer (voir build_message)
+
+        Returns:
+            Nombre de messages envoyés
+        """
+        sent = 0
+        with self._session():
+            for msg in messages:
+                self._send(msg)
+                sent += 1
+        return sent
 
     def send_email(
         self,
-        to_addresses: List[str],
+        to_addresses: Sequence[str],
         subject: str,
         html_content: str,
         from_address: str | None = None,
         from_name: str = "Happy au Rouret"
     ) -> bool:
         """
-        Envoie un email HTML.
+        Envoie un email HTML à tous les destinataires en une seule transaction.
+
+        Les destinataires sont passés uniquement dans l'enveloppe SMTP (comme
+        en copie cachée) : le message n'est transmis qu'une fois au serveur et
+        les adresses ne sont pas divulguées aux autres membres. L'en-tête To:
+        contient l'adresse de l'expéditeur.
 
         Args:
             to_addresses: Liste des adresses email des destinataires
@@ -55,46 +448,151 @@ class EmailSender:
             True si l'envoi a réussi, False sinon
         """
         if not to_addresses:
-            print("Aucun destinataire spécifié")
+            logger.error("Aucun destinataire spécifié")
             return False
 
-        from_address = from_address or self.smtp_user
-
         try:
-            # Créer le message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{from_name} <{from_address}>"
-            msg['To'] = ', '.join(to_addresses)
-
-            # Ajouter le contenu HTML
-            html_part = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(html_part)
-
-            # Se connecter au serveur SMTP et envoyer
-            if self.use_tls:
-                # Utiliser STARTTLS (port 587)
-                with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30) as server:
-                    server.starttls()
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
-            else:
-                # Utiliser SSL (port 465)
-                with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=30) as server:
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
+            from_address = from_address or self.smtp_user
+            msg = self.build_message(
+                [from_address], subject, html_content, from_address, from_name
+            )
+            with self._session():
+                self._send(msg, to_addrs=self._unique(to_addresses))
 
-            print(f"✓ Email envoyé avec succès à {len(to_addresses)} destinataire(s)")
+            logger.info(f"✓ Email envoyé avec succès à {len(to_addresses)} destinataire(s)")
             return True
 
         except smtplib.SMTPAuthenticationError:
-            print("✗ Erreur d'authentification SMTP - Vérifiez vos identifiants")
+            logger.error("✗ Erreur d'authentification SMTP - Vérifiez vos identifiants")
             return False
         except smtplib.SMTPException as e:
-            print(f"✗ Erreur SMTP : {e}")
+            logger.error(f"✗ Erreur SMTP : {e}")
             return False
         except Exception as e:
-            print(f"✗ Erreur lors de l'envoi de l'email : {e}")
+            logger.error(f"✗ Erreur lors de l'envoi de l'email : {e}")
+            return False
+
+    def send_individually(
+        self,
+        to_addresses: Sequence[str],
+        subject: str,
+        html_content: str,
+        from_address: str | None = None,
+        from_name: str = "Happy au Rouret",
+        max_workers: int = 4
+    ) -> int:
+        """
+        Envoie un exemplaire de l'email à chaque destinataire (en-tête To: propre).
+
+        Les envois sont répartis sur ``max_workers`` threads, chacun avec sa
+        propre connexion SMTP persistante, ce qui superpose les allers-retours
+        réseau.
+        Le nombre de threads borne aussi le nombre de connexions simultanées
+        ouvertes chez le fournisseur SMTP.
+
+        Args:
+            to_addresses: Liste des adresses email des destinataires
+            subject: Sujet de l'email
+            html_content: Contenu HTML de l'email
+            from_address: Adresse email de l'expéditeur (par défaut: smtp_user)
+            from_name: Nom de l'expéditeur
+            max_workers: Nombre maximum de connexions SMTP simultanées
+
+        Returns:
+            Nombre d'emails envoyés avec succès
+        """
+        base = self.build_message([], subject, html_content, from_address, from_name)
+        to_addresses = self._unique(to_addresses)
+
+        # Les copies par destinataire sont créées au moment de l'envoi : seuls
+        # les messages en cours de transmission sont gardés en mémoire
+        if max_workers <= 1 or len(to_addresses) < self.MIN_PARALLEL_RECIPIENTS:
+            sent = 0
+            try:
+                with self._session():
+                    for address in to_addresses:
+                        sent += self._deliver(self._with_recipient(base, address), self._send)
+            except smtplib.SMTPAuthenticationError:
+                logger.error("✗ Erreur d'authentification SMTP - Vérifiez vos identifiants")
+            return sent
+
+        # Chaque thread utilise sa propre copie du sender, donc sa propre
+        # connexion (avec recyclage et nouvel essai, voir _send)
+        local = threading.local()
+        senders: List[EmailSender] = []
+        senders_lock = threading.Lock()
+
+        def thread_sender() -> EmailSender:
+            if getattr(local, 'sender', None) is None:
+                local.sender = self._clone().open()
+                with senders_lock:
+                    senders.append(local.sender)
+            return local.sender
+
+        # Après un refus d'authentification, les envois restants sont
+        # abandonnés : chaque nouvelle tentative de connexion risquerait de
+        # faire bloquer le compte par le fournisseur
+        auth_failed = threading.Event()
+
+        def deliver(address: str) -> bool:
+            if auth_failed.is_set():
+                return False
+            try:
+                return self._deliver(
+                    self._with_recipient(base, address),
+                    lambda m: thread_sender()._send(m),
+                )
+            except smtplib.SMTPAuthenticationError:
+                auth_failed.set()
+                return False
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                sent = sum(executor.map(deliver, to_addresses))
+        finally:
+            for sender in senders:
+                sender.close()
+
+        if auth_failed.is_set():
+            logger.error("✗ Erreur d'authentification SMTP - Vérifiez vos identifiants")
+        return sent
+
+    @staticmethod
+    def _unique(addresses: Iterable[str]) -> List[str]:
+        """Retire les adresses en double en conservant l'ordre d'origine."""
+        return list(dict.fromkeys(addresses))
+
+    def _clone(self) -> "EmailSender":
+        """Retourne un sender de même configuration, sans connexion ouverte."""
+        clone = copy.copy(self)
+        clone._server = None
+        clone._keep_open = False
+        clone._sent_on_connection = 0
+        clone._last_used = 0.0
+        return clone
+
+    @staticmethod
+    def _deliver(msg: EmailMessage, send) -> bool:
+        """
+        Envoie un message sans interrompre les envois suivants en cas d'échec.
+
+        Une erreur d'authentification est propagée : elle concerne tous les
+        envois, pas seulement ce message.
+
+        Args:
+            msg: Message à envoyer
+            send: Fonction d'envoi à utiliser pour ce message
+
+        Returns:
+            True si l'envoi a réussi, False sinon
+        """
+        try:
+            send(msg)
+            return True
+        except smtplib.SMTPAuthenticationError:
+            raise
+        except (smtplib.SMTPException, OSError) as e:
+            logger.error(f"✗ Échec de l'envoi à {msg['To']} : {e}")
             return False
 
     def test_connection(self) -> bool:
@@ -105,13 +603,7 @@ class EmailSender:
             True si la connexion réussit, False sinon
         """
         try:
-            if self.use_tls:
-                with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10) as server:
-                    server.starttls()
-                    server.login(self.smtp_user, self.smtp_password)
-            else:
-                with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=10) as server:
-                    server.login(self.smtp_user, self.smtp_password)
+            self._open_server(timeout=10).quit()
 
             print("✓ Connexion SMTP réussie")
             return True
@@ -1,33 +1,76 @@
 """Script principal pour envoyer les emails récapitulatifs du calendrier."""
 
+import json
+import logging
 import os
+import socket
 import sys
-import netrc
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
+from logging.handlers import MemoryHandler
 from pathlib import Path
+from typing import Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from dotenv import load_dotenv
 
-from .calendar_fetcher import CalendarFetcher
-from .email_generator import EmailGenerator
-from .email_sender import EmailSender
-from .website_recap_fetcher import WebsiteRecapFetcher
+# Les modules du projet (icalendar, requests...) sont importés dans main()
+# seulement une fois la configuration validée : un lancement mal configuré
+# échoue ainsi sans payer leur temps d'import.
+
+# Messages d'état du script (voir _setup_logging)
+logger = logging.getLogger('happy')
+
+# Durée de validité de l'adresse IP du serveur SMTP mise en cache (secondes)
+_DNS_CACHE_TTL = 3600
+
+# Délai maximal de la résolution DNS au chargement de la configuration (secondes)
+_DNS_TIMEOUT = 2
+
+# Fichier .env du projet, lu seulement au premier appel de load_config()
+_ENV_PATH = Path(__file__).parent.parent / '.env'
+_DOTENV_LOADED = False
 
 
 def load_netrc_credentials(host: str = "smtp.gmail.com"):
     """
     Charge les identifiants depuis le fichier .netrc.
 
+    Le résultat est mis en cache tant que le fichier n'est pas modifié.
+
     Args:
         host: Nom d'hôte SMTP pour lequel récupérer les identifiants
 
     Returns:
         Tuple (login, password) ou (None, None) si non trouvé
     """
+    netrc_path = Path.home() / '.netrc'
     try:
-        netrc_path = Path.home() / '.netrc'
-        if not netrc_path.exists():
-            return None, None
+        mtime_ns = netrc_path.stat().st_mtime_ns
+    except OSError:
+        return None, None
+
+    return _read_netrc_credentials(str(netrc_path), host, mtime_ns)
 
-        authenticators = netrc.netrc(str(netrc_path))
+
+@lru_cache(maxsize=8)
+def _read_netrc_credentials(netrc_path: str, host: str, mtime_ns: int):
+    """
+    Parse le fichier .netrc (mis en cache par chemin, hôte et date de modification).
+
+    Args:
+        netrc_path: Chemin du fichier .netrc
+        host: Nom d'hôte SMTP pour lequel récupérer les identifiants
+        mtime_ns: Date de modification du fichier, pour invalider le cache
+
+    Returns:
+        Tuple (login, password) ou (None, None) si non trouvé
+    """
+    import netrc
+
+    try:
+        authenticators = netrc.netrc(netrc_path)
         auth = authenticators.authenticators(host)
 
         if auth:
@@ -40,6 +83,73 @@ def load_netrc_credentials(host: str = "smtp.gmail.com"):
         return None, None
 
 
+def _load_dotenv_once():
+    """Charge le fichier .env du projet une seule fois par processus."""
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+
+    load_dotenv(_ENV_PATH)
+    _DOTENV_LOADED = True
+
+
+# Valeurs reconnues comme vraies pour les options booléennes
+_TRUE_SET = frozenset({'true', '1', 'yes', 'on'})
+
+
+def _as_bool(value: str) -> bool:
+    """Convertit une valeur de configuration en booléen (true/1/yes/on)."""
+    return value.strip().lower() in _TRUE_SET
+
+
+def _as_cache_dir(value: str) -> Path:
+    """Retourne le répertoire de cache, par défaut dans ~/.cache."""
+    return Path(value) if value else Path.home() / '.cache' / 'happy_weekly_mailing'
+
+
+def _as_dns_cache_file(value: str) -> Path:
+    """Retourne le fichier du cache DNS, par défaut dans ~/.cache."""
+    return Path(value) if value else _as_cache_dir('') / 'dns.json'
+
+
+def _as_address_list(value: str) -> Tuple[str, ...]:
+    """Découpe une liste d'adresses séparées par des virgules, sans doublons."""
+    return tuple(dict.fromkeys(filter(None, (addr.strip() for addr in value.split(',')))))
+
+
+# Paramètres lus depuis l'environnement :
+# (variable, clé de configuration, valeur par défaut, conversion).
+# Une variable vide (ex. variable GitHub Actions non définie) prend la valeur
+# par défaut.
+_CONFIG_SPEC = (
+    # Configuration du calendrier
+    ('CALENDAR_ID', 'calendar_id', 'happy.rouret@gmail.com', str),
+    ('TIMEZONE', 'timezone', 'Europe/Paris', str),
+    ('DAYS_AHEAD', 'days_ahead', '14', int),
+    ('CALENDAR_CACHE_DIR', 'calendar_cache_dir', '', _as_cache_dir),
+    ('CALENDAR_CACHE_TTL', 'calendar_cache_ttl', '3600', int),
+    ('WEBSITE_RECAP_ENABLED', 'website_recap_enabled', 'true', _as_bool),
+    ('WEBSITE_RECAP_BASE_URL', 'website_recap_base_url', 'https://www.happy-au-rouret.fr', str),
+    ('WEBSITE_RECAP_YEAR', 'website_recap_year', None, int),
+    ('WEBSITE_RECAP_LIMIT', 'website_recap_limit', '3', int),
+
+    # Configuration de l'email
+    ('EMAIL_TEMPLATE', 'template_name', 'design_classique', str),
+    ('EMAIL_SUBJECT', 'email_subject', 'Happy au Rouret - Prochains événements', str),
+    ('FROM_NAME', 'from_name', 'Happy au Rouret', str),
+
+    # Configuration SMTP (identifiants : voir load_config)
+    ('SMTP_HOST', 'smtp_host', 'smtp.gmail.com', str),
+    ('SMTP_PORT', 'smtp_port', '587', int),
+    ('SMTP_USE_TLS', 'use_tls', 'true', _as_bool),
+    ('SMTP_CONCURRENCY', 'smtp_concurrency', '1', int),
+    ('DNS_CACHE_FILE', 'dns_cache_file', '', _as_dns_cache_file),
+
+    # Destinataires
+    ('TO_ADDRESSES', 'to_addresses', '', _as_address_list),
+)
+
+
 def load_config():
     """
     Charge la configuration depuis les variables d'environnement.
@@ -47,53 +157,129 @@ def load_config():
     Returns:
         Dictionnaire avec la configuration
     """
-    # Chercher le fichier .env dans le répertoire du projet
-    env_path = Path(__file__).parent.parent / '.env'
-    load_dotenv(env_path)
-
-    # Récupérer le host SMTP (par défaut Gmail)
-    smtp_host = os.getenv('SMTP_HOST', 'smtp.gmail.com')
-
-    # Essayer de charger les identifiants depuis .netrc en priorité
-    netrc_login, netrc_password = load_netrc_credentials(smtp_host)
-
-    # Utiliser netrc si disponible, sinon les variables d'environnement
-    smtp_user = netrc_login or os.getenv('SMTP_USER')
-    smtp_password = netrc_password or os.getenv('SMTP_PASSWORD')
-
-    config = {
-        # Configuration du calendrier
-        'calendar_id': os.getenv('CALENDAR_ID', 'happy.rouret@gmail.com'),
-        'timezone': os.getenv('TIMEZONE', 'Europe/Paris'),
-        'days_ahead': int(os.getenv('DAYS_AHEAD', '14')),
-        'website_recap_enabled': os.getenv('WEBSITE_RECAP_ENABLED', 'true').lower() == 'true',
-        'website_recap_base_url': os.getenv('WEBSITE_RECAP_BASE_URL', 'https://www.happy-au-rouret.fr'),
-        'website_recap_year': int(os.getenv('WEBSITE_RECAP_YEAR')) if os.getenv('WEBSITE_RECAP_YEAR') else None,
-        'website_recap_limit': int(os.getenv('WEBSITE_RECAP_LIMIT', '3')),
-
-        # Configuration de l'email
-        'template_name': os.getenv('EMAIL_TEMPLATE', 'design_classique'),
-        'email_subject': os.getenv('EMAIL_SUBJECT', 'Happy au Rouret - Prochains événements'),
-        'from_name': os.getenv('FROM_NAME', 'Happy au Rouret'),
-
-        # Configuration SMTP
-        'smtp_host': smtp_host,
-        'smtp_port': int(os.getenv('SMTP_PORT', '587')),
-        'smtp_user': smtp_user,
-        'smtp_password': smtp_password,
-        'use_tls': os.getenv('SMTP_USE_TLS', 'true').lower() == 'true',
-        'using_netrc': bool(netrc_login and netrc_password),
-
-        # Destinataires
-        'to_addresses': os.getenv('TO_ADDRESSES', '').split(','),
-    }
-
-    # Nettoyer les adresses email (supprimer les espaces)
-    config['to_addresses'] = [addr.strip() for addr in config['to_addresses'] if addr.strip()]
+    _load_dotenv_once()
+
+    env = os.environ
+    config = {}
+    for env_key, config_key, default, cast in _CONFIG_SPEC:
+        value = env.get(env_key) or default
+        config[config_key] = cast(value) if value is not None else None
+
+    # Fuseau construit une seule fois et transmis aux différents modules
+    try:
+        config['tz'] = ZoneInfo(config['timezone'])
+    except (ZoneInfoNotFoundError, ValueError):
+        config['tz'] = None
+
+    # Essayer de charger les identifiants depuis .netrc en priorité,
+    # sinon utiliser les variables d'environnement
+    netrc_login, netrc_password = load_netrc_credentials(config['smtp_host'])
+    config['smtp_user'] = netrc_login or env.get('SMTP_USER')
+    config['smtp_password'] = netrc_password or env.get('SMTP_PASSWORD')
+    config['using_netrc'] = bool(netrc_login and netrc_password)
+
+    # Résoudre le serveur SMTP dès maintenant (None : résolution à la connexion)
+    config['smtp_ip'] = resolve_smtp_host(
+        config['smtp_host'], config['smtp_port'], config['dns_cache_file']
+    )
 
     return config
 
 
+def _load_dns_cache(cache_file: Path) -> dict:
+    """Charge le cache DNS, ou un cache vide s'il est absent ou illisible."""
+    try:
+        cache = json.loads(cache_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _store_dns_cache(cache_file: Path, cache: dict):
+    """Enregistre le cache DNS ; une erreur d'écriture est ignorée."""
+    from .cache import write_atomic
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(cache_file, json.dumps(cache).encode('utf-8'))
+    except OSError:
+        pass
+
+
+def _getaddrinfo(host: str, port: int):
+    """
+    Résout le serveur SMTP en au plus _DNS_TIMEOUT secondes.
+
+    getaddrinfo ne peut pas être interrompu : il s'exécute dans un thread
+    démon abandonné si le délai est dépassé.
+    """
+    future = Future()
+
+    def lookup():
+        try:
+            future.set_result(socket.getaddrinfo(
+                host, port,
+                type=socket.SOCK_STREAM,
+                flags=socket.AI_ADDRCONFIG | socket.AI_NUMERICSERV,
+            ))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=lookup, daemon=True).start()
+    return future.result(timeout=_DNS_TIMEOUT)
+
+
+def resolve_smtp_host(host: str, port: int, cache_file: Path):
+    """
+    Résout l'adresse IP du serveur SMTP, avec un cache disque d'une heure.
+
+    La résolution est limitée à _DNS_TIMEOUT secondes : au-delà, la
+    connexion se fera avec le nom d'hôte.
+
+    Args:
+        host: Nom d'hôte SMTP
+        port: Port SMTP
+        cache_file: Fichier du cache DNS
+
+    Returns:
+        Adresse IP du serveur, ou None si la résolution a échoué
+    """
+    key = f"{host}:{port}"
+    cache = _load_dns_cache(cache_file)
+
+    entry = cache.get(key)
+    if isinstance(entry, dict) and time.time() - entry.get('resolved_at', 0) < _DNS_CACHE_TTL:
+        return entry.get('address')
+
+    try:
+        infos = _getaddrinfo(host, port)
+    except (OSError, UnicodeError):
+        # TimeoutError (délai dépassé) est une sous-classe d'OSError
+        return None
+    address = infos[0][4][0]
+
+    cache[key] = {'address': address, 'resolved_at': time.time()}
+    _store_dns_cache(cache_file, cache)
+
+    return address
+
+
+def forget_smtp_host(host: str, port: int, cache_file: Path):
+    """
+    Retire du cache DNS l'adresse du serveur SMTP (par exemple injoignable).
+
+    Le lancement suivant refait la résolution DNS.
+
+    Args:
+        host: Nom d'hôte SMTP
+        port: Port SMTP
+        cache_file: Fichier du cache DNS
+    """
+    cache = _load_dns_cache(cache_file)
+    if cache.pop(f"{host}:{port}", None) is not None:
+        _store_dns_cache(cache_file, cache)
+
+
 def validate_config(config):
     """
     Valide la configuration.
@@ -113,124 +299,243 @@ def validate_config(config):
     if not config['to_addresses']:
         return False, "Aucun destinataire spécifié (TO_ADDRESSES)"
 
+    if config.get('tz') is None:
+        return False, f"Fuseau horaire inconnu (TIMEZONE) : {config['timezone']}"
+
     return True, ""
 
 
+def _quick_check():
+    """
+    Vérifie sans lire aucun fichier qu'une configuration minimale est possible.
+
+    Seule la présence des fichiers .env et .netrc est testée : si le
+    fichier .env existe, la vérification complète est laissée à
+    validate_config.
+
+    Returns:
+        Message d'erreur, ou None si la configuration peut être chargée
+    """
+    if _ENV_PATH.exists():
+        return None
+
+    if not os.environ.get('TO_ADDRESSES'):
+        return "Aucun destinataire spécifié (TO_ADDRESSES)"
+
+    missing_fields = [
+        field for field in ('SMTP_USER', 'SMTP_PASSWORD') if not os.environ.get(field)
+    ]
+    if missing_fields and not (Path.home() / '.netrc').exists():
+        return f"Configuration incomplète. Variables manquantes : {', '.join(missing_fields)}"
+
+    return None
+
+
+def _log_config_error(error_msg: str, using_netrc: bool = False):
+    """Signale une erreur de configuration et les façons de la corriger."""
+    lines = [f"✗ Erreur : {error_msg}", ""]
+    if not using_netrc:
+        lines += [
+            "💡 Vous pouvez configurer les identifiants SMTP de deux façons :",
+            "   1. Fichier .netrc (recommandé) - Voir README.md pour les instructions",
+            "   2. Fichier .env - Voir .env.example pour un exemple",
+        ]
+    logger.error("\n".join(lines))
+
+
+def _setup_logging() -> MemoryHandler:
+    """
+    Prépare le logger du script.
+
+    Les messages du script et des modules (loggers « happy.* ») sont gardés
+    en mémoire et écrits sur la sortie standard par blocs (voir _flush_logs),
+    ou immédiatement pour les erreurs. Le niveau
+    se règle avec la variable d'environnement LOG_LEVEL (INFO par défaut,
+    WARNING pour n'afficher que les problèmes, par exemple depuis cron).
+
+    Returns:
+        Handler à fermer en fin d'exécution
+    """
+    level = logging.getLevelName(os.environ.get('LOG_LEVEL', 'INFO').strip().upper())
+    logger.setLevel(level if isinstance(level, int) else logging.INFO)
+    logger.propagate = False
+
+    handler = MemoryHandler(200, target=logging.StreamHandler(sys.stdout))
+    logger.addHandler(handler)
+    return handler
+
+
+def _flush_logs():
+    """Écrit les messages en attente, avant une étape qui peut être longue."""
+    for handler in logger.handlers:
+        handler.flush()
+
+
 def main():
     """Point d'entrée principal du script."""
-    print("=" * 60)
-    print("  Happy au Rouret - Envoi d'email récapitulatif")
-    print("=" * 60)
-    print()
+    handler = _setup_logging()
+    try:
+        return _run()
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def _run():
+    """Enchaîne les étapes du script et retourne le code de sortie."""
+    # Échouer immédiatement si la configuration ne peut pas être complète
+    error_msg = _quick_check()
+    if error_msg:
+        _log_config_error(error_msg)
+        return 1
+
+    # Lire .env et .netrc en arrière-plan pendant l'affichage de l'en-tête
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        config_future = executor.submit(load_config)
+
+        # Les blocs de statut sont journalisés en un seul message par étape
+        logger.info("\n".join([
+            "=" * 60,
+            "  Happy au Rouret - Envoi d'email récapitulatif",
+            "=" * 60,
+            "",
+        ]))
 
-    # Charger la configuration
-    print("📋 Chargement de la configuration...")
-    config = load_config()
+        # Charger la configuration
+        logger.info("📋 Chargement de la configuration...")
+        config = config_future.result()
 
     # Valider la configuration
     is_valid, error_msg = validate_config(config)
     if not is_valid:
-        print(f"✗ Erreur : {error_msg}")
-        print()
-        if not config.get('using_netrc'):
-            print("💡 Vous pouvez configurer les identifiants SMTP de deux façons :")
-            print("   1. Fichier .netrc (recommandé) - Voir README.md pour les instructions")
-            print("   2. Fichier .env - Voir .env.example pour un exemple")
+        _log_config_error(error_msg, config.get('using_netrc'))
         return 1
 
-    print(f"   Calendrier : {config['calendar_id']}")
-    print(f"   Template : {config['template_name']}")
-    print(f"   Période : {config['days_ahead']} jours")
-    print(f"   Destinataires : {len(config['to_addresses'])} adresse(s)")
     if config.get('using_netrc'):
-        print(f"   Authentification : .netrc ({config['smtp_host']})")
+        auth_line = f"   Authentification : .netrc ({config['smtp_host']})"
     else:
-        print(f"   Authentification : Variables d'environnement")
-    print()
+        auth_line = "   Authentification : Variables d'environnement"
+    logger.info("\n".join([
+        f"   Calendrier : {config['calendar_id']}",
+        f"   Template : {config['template_name']}",
+        f"   Période : {config['days_ahead']} jours",
+        f"   Destinataires : {len(config['to_addresses'])} adresse(s)",
+        auth_line,
+        "",
+    ]))
+
+    from .calendar_fetcher import CalendarFetcher
+    from .email_generator import EmailGenerator
+    from .email_sender import EmailSender
+    from .website_recap_fetcher import WebsiteRecapFetcher
 
     # Récupérer les événements
-    print("📅 Récupération des événements...")
+    logger.info("📅 Récupération des événements...")
+    _flush_logs()
     try:
-        fetcher = CalendarFetcher(config['calendar_id'], config['timezone'])
+        fetcher = CalendarFetcher(
+            config['calendar_id'],
+            config['tz'],
+            cache_dir=config['calendar_cache_dir'],
+            ttl_seconds=config['calendar_cache_ttl'],
+        )
         events = fetcher.fetch_events(config['days_ahead'])
 
         if not events:
-            print("   Aucun événement trouvé pour la période spécifiée.")
-            print()
-            print("ℹ️  Aucun email ne sera envoyé.")
+            logger.info("\n".join([
+                "   Aucun événement trouvé pour la période spécifiée.",
+                "",
+                "ℹ️  Aucun email ne sera envoyé.",
+            ]))
             return 0
 
-        print(f"   ✓ {len(events)} événement(s) trouvé(s)")
-        for event in events:
-            print(f"      - {event['title']} ({event['start_datetime'].strftime('%d/%m/%Y')})")
-        print()
+        lines = [f"   ✓ {len(events)} événement(s) trouvé(s)"]
+        date_format = '%d/%m/%Y'
+        lines += [
+            f"      - {event['title']} ({event['start_datetime'].strftime(date_format)})"
+            for event in events
+        ]
+        lines.append("")
+        logger.info("\n".join(lines))
 
     except Exception as e:
-        print(f"   ✗ Erreur : {e}")
+        logger.error(f"   ✗ Erreur : {e}")
         return 1
 
     # Formater les événements pour l'email
-    print("🎨 Génération de l'email...")
+    logger.info("🎨 Génération de l'email...")
     try:
-        formatted_events = [fetcher.format_event_for_email(event) for event in events]
+        formatted_events = fetcher.format_events_for_email(events)
 
         recap_items = []
         if config['website_recap_enabled']:
-            print("🌐 Récupération des dernières nouvelles du site...")
+            logger.info("🌐 Récupération des dernières nouvelles du site...")
             try:
                 recap_fetcher = WebsiteRecapFetcher(
                     base_url=config['website_recap_base_url'],
-                    timezone=config['timezone'],
+                    timezone=config['tz'],
                     year=config['website_recap_year'],
                 )
                 recap_items = recap_fetcher.fetch_latest(config['website_recap_limit'])
-                print(f"   ✓ {len(recap_items)} contenu(s) récent(s) trouvé(s)")
+                logger.info(f"   ✓ {len(recap_items)} contenu(s) récent(s) trouvé(s)")
             except Exception as e:
-                print(f"   ⚠️  Recap site indisponible : {e}")
+                logger.warning(f"   ⚠️  Recap site indisponible : {e}")
 
         generator = EmailGenerator(config['template_name'])
         html_content = generator.generate(formatted_events, recap_items)
 
-        print(f"   ✓ Email généré ({len(html_content)} caractères)")
-        print()
+        logger.info(f"   ✓ Email généré ({len(html_content)} caractères)\n")
 
     except Exception as e:
-        print(f"   ✗ Erreur : {e}")
+        logger.error(f"   ✗ Erreur : {e}")
         return 1
 
     # Envoyer l'email
-    print("📧 Envoi de l'email...")
+    logger.info("📧 Envoi de l'email...")
+    _flush_logs()
     try:
         sender = EmailSender(
             smtp_host=config['smtp_host'],
             smtp_port=config['smtp_port'],
             smtp_user=config['smtp_user'],
             smtp_password=config['smtp_password'],
-            use_tls=config['use_tls']
+            use_tls=config['use_tls'],
+            smtp_ip=config['smtp_ip'],
+            on_unreachable_ip=partial(
+                forget_smtp_host,
+                config['smtp_host'], config['smtp_port'], config['dns_cache_file'],
+            )
         )
 
-        success = sender.send_email(
-            to_addresses=config['to_addresses'],
-            subject=config['email_subject'],
-            html_content=html_content,
-            from_name=config['from_name']
-        )
+        if config['smtp_concurrency'] > 1:
+            # Un email par destinataire, réparti sur plusieurs connexions SMTP
+            sent = sender.send_individually(
+                to_addresses=config['to_addresses'],
+                subject=config['email_subject'],
+                html_content=html_content,
+                from_name=config['from_name'],
+                max_workers=config['smtp_concurrency']
+            )
+            logger.info(f"   {sent}/{len(config['to_addresses'])} email(s) envoyé(s)")
+            success = sent == len(config['to_addresses'])
+        else:
+            # Une seule session SMTP (TLS + authentification) pour tout l'envoi
+            with sender:
+                success = sender.send_email(
+                    to_addresses=config['to_addresses'],
+                    subject=config['email_subject'],
+                    html_content=html_content,
+                    from_name=config['from_name']
+                )
 
         if success:
-            print()
-            print("=" * 60)
-            print("  ✓ Email envoyé avec succès !")
-            print("=" * 60)
+            logger.info("\n".join(["", "=" * 60, "  ✓ Email envoyé avec succès !", "=" * 60]))
             return 0
-        else:
-            print()
-            print("=" * 60)
-            print("  ✗ Échec de l'envoi de l'email")
-            print("=" * 60)
-            return 1
+        logger.error("\n".join(["", "=" * 60, "  ✗ Échec de l'envoi de l'email", "=" * 60]))
+        return 1
 
     except Exception as e:
-        print(f"   ✗ Erreur : {e}")
+        logger.error(f"   ✗ Erreur : {e}")
         return 1
 
 
@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, tzinfo
 from html import unescape
 from html.parser import HTMLParser
 from typing import Dict, List
 from urllib.parse import urldefrag, urljoin
+from zoneinfo import ZoneInfo
 
-import pytz
 import requests
 
 
@@ -154,11 +154,11 @@ class WebsiteRecapFetcher:
     def __init__(
         self,
         base_url: str = "https://www.happy-au-rouret.fr",
-        timezone: str = "Europe/Paris",
+        timezone: str | tzinfo = "Europe/Paris",
         year: int | None = None,
     ):
         self.base_url = base_url.rstrip("/")
-        self.timezone = pytz.timezone(timezone)
+        self.timezone = ZoneInfo(timezone) if isinstance(timezone, str) else timezone
         self.year = year
 
     def fetch_latest(self, limit: int = 3) -> List[Dict[str, str]]:
@@ -0,0 +1,427 @@
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+from zoneinfo import ZoneInfo
+
+from icalendar import Event
+
+from happy_weekly_mailing.calendar_fetcher import CalendarFetcher
+
+
+def build_ical(*events):
+    """Construit un flux iCal minimal à partir de (titre, début) en UTC."""
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//tests//FR"]
+    for index, (title, start) in enumerate(events):
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:event-{index}@tests",
+            f"DTSTART:{start.strftime('%Y%m%dT%H%M%SZ')}",
+            f"DTEND:{(start + timedelta(hours=2)).strftime('%Y%m%dT%H%M%SZ')}",
+            f"SUMMARY:{title}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+def mock_response(status_code=200, content=b"", headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    response.raise_for_status.return_value = None
+    return response
+
+
+class CalendarFetcherCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._tmp.name)
+        soon = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=2)
+        self.ical = build_ical(("Repas partagé", soon))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    @patch.object(CalendarFetcher._session, "get")
+    def test_fetch_events_reuses_fresh_cache_without_request(self, get_mock):
+        get_mock.return_value = mock_response(content=self.ical, headers={"ETag": '"v1"'})
+        fetcher = CalendarFetcher("cal@example.test", cache_dir=self.cache_dir)
+
+        first = fetcher.fetch_events(7)
+        second = fetcher.fetch_events(7)
+
+        self.assertEqual([e["title"] for e in first], ["Repas partagé"])
+        self.assertEqual([e["title"] for e in second], ["Repas partagé"])
+        get_mock.assert_called_once()
+
+    @patch.object(CalendarFetcher._session, "get")
+    def test_fetch_events_revalidates_stale_cache_with_conditional_headers(self, get_mock):
+        get_mock.return_value = mock_response(
+            content=self.ical,
+            headers={"ETag": '"v1"', "Last-Modified": "Mon, 05 Jan 2026 10:00:00 GMT"},
+        )
+        CalendarFetcher("cal@example.test", cache_dir=self.cache_dir).fetch_events(7)
+
+        get_mock.reset_mock()
+        get_mock.return_value = mock_response(status_code=304)
+        fetcher = CalendarFetcher("cal@example.test", cache_dir=self.cache_dir, ttl_seconds=0)
+        events = fetcher.fetch_events(7)
+
+        self.assertEqual([e["title"] for e in events], ["Repas partagé"])
+        headers = get_mock.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Mon, 05 Jan 2026 10:00:00 GMT")
+
+    @patch.object(CalendarFetcher._session, "get")
+    def test_fetch_events_without_cache_dir_always_downloads(self, get_mock):
+        get_mock.return_value = mock_response(content=self.ical)
+        fetcher = CalendarFetcher("cal@example.test")
+
+        fetcher.fetch_events(7)
+        fetcher.fetch_events(7)
+
+        self.assertEqual(get_mock.call_count, 2)
+        self.assertNotIn("If-None-Match", get_mock.call_args.kwargs["headers"])
+
+    @patch.object(CalendarFetcher._session, "get")
+    def test_fetch_events_ignores_malformed_cache_meta(self, get_mock):
+        get_mock.return_value = mock_response(content=self.ical, headers={"ETag": '"v1"'})
+        fetcher = CalendarFetcher("cal@example.test", cache_dir=self.cache_dir)
+        fetcher._store_cache({}, self.ical)
+
+        for meta in ['[]', '{"mtime": null}', '{"mtime": "1"}', '{"mtime": true}']:
+            with self.subTest(meta=meta):
+                get_mock.reset_mock()
+                fetcher._cache_file(".json").write_text(meta, encoding="utf-8")
+
+                events = fetcher.fetch_events(7)
+
+                self.assertEqual([e["title"] for e in events], ["Repas partagé"])
+                self.assertNotIn("If-None-Match", get_mock.call_args.kwargs["headers"])
+                self.assertEqual(fetcher._load_cache_meta()["etag"], '"v1"')
+
+    def test_failed_cache_write_keeps_previous_file(self):
+        fetcher = CalendarFetcher("cal@example.test", cache_dir=self.cache_dir)
+        fetcher._store_cache({"etag": '"v1"', "mtime": 1.0}, self.ical)
+
+        with patch("happy_weekly_mailing.cache.os.replace", side_effect=OSError("disk full")), \
+                self.assertLogs("happy.calendar_fetcher", level="WARNING"):
+            fetcher._store_cache({"etag": '"v2"', "mtime": 2.0}, b"BEGIN:VCALENDAR")
+
+        self.assertEqual(fetcher._load_cached_body(), self.ical)
+        self.assertEqual(fetcher._load_cache_meta(), {"etag": '"v1"', "mtime": 1.0})
+        self.assertEqual(sorted(p.suffix for p in self.cache_dir.iterdir()), [".ics", ".json"])
+
+
+class CalendarFetcherWindowTest(unittest.TestCase):
+    @patch.object(CalendarFetcher._session, "get")
+    def test_fetch_events_keeps_only_events_in_window(self, get_mock):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        get_mock.return_value = mock_response(
+            content=build_ical(
+                ("Assemblée 2019", now - timedelta(days=2000)),
+                ("Balade de la semaine", now + timedelta(days=3)),
+                ("Sortie lointaine", now + timedelta(days=60)),
+            )
+        )
+
+        events = CalendarFetcher("cal@example.test").fetch_events(14)
+
+        self.assertEqual([e["title"] for e in events], ["Balade de la semaine"])
+
+    def test_fast_scan_keeps_only_event_blocks_in_window(self):
+        ical = (
+            b"BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"
+            b"BEGIN:VTIMEZONE\r\nTZID:Europe/Paris\r\nEND:VTIMEZONE\r\n"
+            b"BEGIN:VEVENT\r\nSUMMARY:Ancien\r\nDTSTART:20190105T100000Z\r\nEND:VEVENT\r\n"
+            b"BEGIN:VEVENT\r\nSUMMARY:Local\r\nDTSTART;TZID=Europe/Paris:20260810T100000\r\nEND:VEVENT\r\n"
+            b"BEGIN:VEVENT\r\nSUMMARY:Journee\r\nDTSTART;VALUE=DATE:20260812\r\nEND:VEVENT\r\n"
+            b"BEGIN:VEVENT\r\nSUMMARY:Sans date\r\nEND:VEVENT\r\n"
+            b"BEGIN:VEVENT\r\nSUMMARY:Lointain\r\nDTSTART:20270105T100000Z\r\nEND:VEVENT\r\n"
+            b"END:VCALENDAR\r\n"
+        )
+
+        reduced = CalendarFetcher._fast_scan(ical, date(2026, 8, 1), date(2026, 8, 31))
+
+        self.assertNotIn(b"Ancien", reduced)
+        self.assertNotIn(b"Lointain", reduced)
+        for kept in [b"VTIMEZONE", b"Local", b"Journee", b"Sans date", b"END:VCALENDAR"]:
+            self.assertIn(kept, reduced)
+
+    def test_select_window_timezone_uses_fixed_offset_without_dst_change(self):
+        fetcher = CalendarFetcher("cal@example.test")
+        paris = fetcher.timezone
+
+        winter = fetcher._select_window_timezone(
+            datetime(2026, 1, 5, tzinfo=paris), datetime(2026, 2, 5, tzinfo=paris)
+        )
+        across_dst = fetcher._select_window_timezone(
+            datetime(2026, 3, 20, tzinfo=paris), datetime(2026, 4, 10, tzinfo=paris)
+        )
+
+        self.assertEqual(winter.utcoffset(None), timedelta(hours=1))
+        self.assertIs(across_dst, paris)
+
+    def test_select_window_timezone_detects_two_dst_changes_in_long_window(self):
+        fetcher = CalendarFetcher("cal@example.test")
+        start = datetime(2026, 10, 1, tzinfo=fetcher.timezone)
+
+        fetcher._set_window(start, start + timedelta(days=365))
+        local = fetcher._to_local(datetime(2027, 1, 15, 9, 0, tzinfo=timezone.utc))
+
+        self.assertIs(fetcher._window_tz, fetcher.timezone)
+        self.assertEqual(local.strftime("%H:%M"), "10:00")
+        self.assertEqual(local.utcoffset(), timedelta(hours=1))
+
+    def test_to_local_keeps_wall_clock_for_floating_times(self):
+        fetcher = CalendarFetcher("cal@example.test")
+        paris = fetcher.timezone
+        fetcher._set_window(datetime(2026, 6, 1, tzinfo=paris), datetime(2026, 6, 30, tzinfo=paris))
+
+        local = fetcher._to_local(datetime(2026, 6, 10, 9, 30))
+        converted = fetcher._to_local(datetime(2026, 6, 10, 7, 30, tzinfo=timezone.utc))
+
+        self.assertEqual(local.strftime("%H:%M"), "09:30")
+        self.assertEqual(converted.strftime("%H:%M"), "09:30")
+        self.assertEqual(local, datetime(2026, 6, 10, 9, 30, tzinfo=paris))
+
+    def test_multi_day_event_ending_after_dst_change(self):
+        fetcher = CalendarFetcher("cal@example.test")
+        paris = fetcher.timezone
+        now = datetime(2026, 10, 15, 8, 0, tzinfo=paris)
+        fetcher._set_window(now - timedelta(days=1), now + timedelta(days=8))
+
+        for start, end in [
+            (datetime(2026, 10, 21, 7, 0, tzinfo=timezone.utc), datetime(2026, 10, 26, 17, 0, tzinfo=timezone.utc)),
+            (datetime(2026, 10, 21, 9, 0), datetime(2026, 10, 26, 18, 0)),
+        ]:
+            component = Event()
+            component.add("summary", "Séminaire")
+            component.add("dtstart", start)
+            component.add("dtend", end)
+
+            event = fetcher._parse_event(component, now, now + timedelta(days=7))
+
+            self.assertEqual(event["start_datetime"].strftime("%H:%M"), "09:00")
+            self.assertEqual(event["end_datetime"].strftime("%H:%M"), "18:00")
+            self.assertEqual(
+                event["end_datetime"].astimezone(timezone.utc),
+                datetime(2026, 10, 26, 17, 0, tzinfo=timezone.utc),
+            )
+
+
+class CalendarFetcherFormatTest(unittest.TestCase):
+    def setUp(self):
+        self.fetcher = CalendarFetcher("cal@example.test")
+        self.start = datetime(2026, 8, 14, 12, 0, tzinfo=self.fetcher.timezone)
+
+    def make_event(self, title, **overrides):
+        event = {
+            "title": title,
+            "description": "",
+            "location": "Salle des fêtes",
+            "start_datetime": self.start,
+            "end_datetime": self.start + timedelta(hours=2),
+            "is_all_day": False,
+        }
+        event.update(overrides)
+        return event
+
+    def test_format_event_for_email_picks_icon_from_title_keywords(self):
+        icons = {
+            title: self.fetcher.format_event_for_email(self.make_event(title))["icon"]
+            for title in [
+                "Repas partagé",
+                "Randonnée au Cheiron",
+                "Jardin collectif",
+                "Visite du musée",
+                "Assemblée générale",
+                "DÉJEUNER DES AÎNÉS",
+                "Loto",
+            ]
+        }
+
+        self.assertEqual(
+            icons,
+            {
+                "Repas partagé": "🍽️",
+                "Randonnée au Cheiron": "🥾",
+                "Jardin collectif": "🌱",
+                "Visite du musée": "🚌",
+                "Assemblée générale": "📋",
+                "DÉJEUNER DES AÎNÉS": "🍽️",
+                "Loto": "🎉",
+            },
+        )
+
+    def test_format_event_for_email_color_is_stable_for_a_title(self):
+        first = self.fetcher.format_event_for_email(self.make_event("Loto"))
+        second = self.fetcher.format_event_for_email(self.make_event("Loto"))
+
+        self.assertEqual(first["event_color"], second["event_color"])
+        self.assertIn(first["event_color"], ["#ff6b6b", "#feca57", "#48dbfb", "#ff9ff3", "#54a0ff"])
+
+    def test_format_event_for_email_formats_date_and_time(self):
+        formatted = self.fetcher.format_event_for_email(self.make_event("Loto"))
+
+        self.assertEqual(formatted["day"], "14")
+        self.assertEqual(formatted["month"], "Août")
+        self.assertEqual(formatted["month_short"], "Août")
+        self.assertEqual(formatted["time"], "12:00 - 14:00")
+
+    def test_format_event_for_email_escapes_description(self):
+        formatted = self.fetcher.format_event_for_email(
+            self.make_event("Loto", description='Apportez <span>vos</span> lots & "bonne humeur"')
+        )
+
+        self.assertIn(
+            "Apportez &lt;span&gt;vos&lt;/span&gt; lots &amp; &quot;bonne humeur&quot;</p>",
+            formatted["description"],
+        )
+
+    def test_format_event_for_email_keeps_google_rich_text(self):
+        description = (
+            'Bonjour,<br>Programme :<ul><li><b>Jeux</b></li><li><i>Goûter</i></li></ul>'
+            '<a href="https://example.test/?a=1&amp;b=2" target="_blank">Inscription</a>'
+            '<a href="javascript:alert(1)">piège</a><script>alert(1)</script><b>non fermé'
+        )
+
+        formatted = self.fetcher.format_event_for_email(self.make_event("Loto", description=description))
+
+        self.assertIn(
+            'Bonjour,<br>Programme :<ul><li><b>Jeux</b></li><li><i>Goûter</i></li></ul>'
+            '<a href="https://example.test/?a=1&amp;b=2">Inscription</a>'
+            '<a>piège</a>&lt;script&gt;alert(1)&lt;/script&gt;<b>non fermé</b></p>',
+            formatted["description"],
+        )
+
+    def test_format_event_for_email_escapes_title_and_location(self):
+        event = self.make_event("Loto <Quiz> & Co", location="Salle \"Les Pins\" & jardin")
+
+        formatted = self.fetcher.format_event_for_email(event)
+
+        self.assertEqual(formatted["title"], "Loto &lt;Quiz&gt; &amp; Co")
+        self.assertEqual(formatted["location"], "Salle &quot;Les Pins&quot; &amp; jardin")
+        self.assertIn("Loto%20%3CQuiz%3E%20%26%20Co", formatted["add_to_google"])
+
+    def test_format_event_for_email_skips_blank_description(self):
+        formatted = self.fetcher.format_event_for_email(
+            self.make_event("Loto", description="  \n ")
+        )
+
+        self.assertEqual(formatted["description"], "")
+
+    def test_format_event_for_email_returns_independent_copies(self):
+        first = self.fetcher.format_event_for_email(self.make_event("Loto"))
+        first["title"] = "Modifié"
+
+        second = self.fetcher.format_event_for_email(self.make_event("Loto"))
+
+        self.assertEqual(second["title"], "Loto")
+
+    def test_format_event_for_email_cache_distinguishes_timezones(self):
+        utc_start = self.start.astimezone(timezone.utc)
+
+        local = self.fetcher.format_event_for_email(self.make_event("Loto"))
+        utc = self.fetcher.format_event_for_email(
+            self.make_event("Loto", start_datetime=utc_start, end_datetime=None)
+        )
+        local_again = self.fetcher.format_event_for_email(
+            self.make_event("Loto", end_datetime=None)
+        )
+
+        self.assertEqual(local["time"], "12:00 - 14:00")
+        self.assertEqual(utc["time"], "10:00")
+        self.assertEqual(local_again["time"], "12:00")
+
+    def test_format_events_for_email_keeps_order(self):
+        events = [self.make_event("Loto"), self.make_event("Balade")]
+
+        formatted = self.fetcher.format_events_for_email(events)
+
+        self.assertEqual(
+            formatted,
+            [self.fetcher.format_event_for_email(event) for event in events],
+        )
+
+    def test_format_event_for_email_builds_calendar_links_in_utc(self):
+        formatted = self.fetcher.format_event_for_email(
+            self.make_event("Repas & jeux 1/2", location="Place de l'église")
+        )
+
+        self.assertEqual(
+            formatted["add_to_google"],
+            "https://calendar.google.com/calendar/render?action=TEMPLATE"
+            "&text=Repas%20%26%20jeux%201%2F2&dates=20260814T100000Z/20260814T120000Z"
+            "&details=&location=Place%20de%20l%27%C3%A9glise",
+        )
+        self.assertIn("startdt=20260814T100000Z", formatted["add_to_outlook"])
+        self.assertIn("et=20260814T120000Z", formatted["add_to_yahoo"])
+        self.assertEqual(formatted["add_to_ical"], formatted["add_to_google"])
+
+
+class CalendarFetcherTimezoneTest(unittest.TestCase):
+    def test_default_timezone_is_shared_paris_zone(self):
+        first = CalendarFetcher("a@example.test")
+        second = CalendarFetcher("b@example.test", timezone="")
+
+        self.assertEqual(first.timezone.key, "Europe/Paris")
+        self.assertIs(first.timezone, second.timezone)
+
+    def test_explicit_timezone_is_used(self):
+        fetcher = CalendarFetcher("a@example.test", timezone="America/Montreal")
+
+        self.assertEqual(fetcher.timezone.key, "America/Montreal")
+
+    def test_tzinfo_object_is_used_as_is(self):
+        paris = ZoneInfo("Europe/Paris")
+        fetcher = CalendarFetcher("a@example.test", timezone=paris)
+
+        self.assertIs(fetcher.timezone, paris)
+
+    def test_naive_datetimes_are_localized_with_zoneinfo(self):
+        fetcher = CalendarFetcher("a@example.test", timezone=ZoneInfo("Europe/Paris"))
+
+        local = fetcher._to_local(datetime(2026, 7, 14, 10, 0))
+
+        self.assertEqual(local.utcoffset(), timedelta(hours=2))
+
+    def test_window_timezone_keeps_zone_across_dst_change(self):
+        paris = ZoneInfo("Europe/Paris")
+        fetcher = CalendarFetcher("a@example.test", timezone=paris)
+        start = datetime(2026, 10, 20, tzinfo=paris)
+
+        self.assertIs(fetcher._select_window_timezone(start, start + timedelta(days=14)), paris)
+        self.assertEqual(
+            fetcher._select_window_timezone(start - timedelta(days=14), start).utcoffset(None),
+            timedelta(hours=2),
+        )
+
+
+class CalendarFetcherManyTest(unittest.TestCase):
+    @patch.object(CalendarFetcher._session, "get")
+    def test_fetch_events_many_returns_events_per_calendar(self, get_mock):
+        soon = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=2)
+        feeds = {
+            "a@example.test": build_ical(("Randonnée", soon)),
+            "b@example.test": build_ical(("Jardin partagé", soon)),
+        }
+        get_mock.side_effect = lambda url, **kwargs: mock_response(
+            content=next(body for cid, body in feeds.items() if f"/{cid}/" in url)
+        )
+
+        events = CalendarFetcher.fetch_events_many(list(feeds), days_ahead=7)
+
+        self.assertEqual(list(events), ["a@example.test", "b@example.test"])
+        self.assertEqual([e["title"] for e in events["a@example.test"]], ["Randonnée"])
+        self.assertEqual([e["title"] for e in events["b@example.test"]], ["Jardin partagé"])
+
+    def test_fetch_events_many_without_calendars_returns_empty_dict(self):
+        self.assertEqual(CalendarFetcher.fetch_events_many([]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
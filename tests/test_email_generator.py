@@ -32,5 +32,49 @@ class EmailGeneratorRecapTest(unittest.TestCase):
         self.assertIn("https://example.test/thumb.jpg", html)
 
 
+class EmailGeneratorEventsTest(unittest.TestCase):
+    def make_event(self, title):
+        return {
+            "day": "14",
+            "month": "Août",
+            "month_short": "Août",
+            "time": "12:00 - 14:00",
+            "title": title,
+            "location": "Salle des fêtes",
+            "description": "",
+            "event_color": "#48dbfb",
+            "icon": "🍽️",
+            "add_to_google": "https://calendar.google.com/x",
+            "add_to_outlook": "https://outlook.live.com/x",
+            "add_to_yahoo": "https://calendar.yahoo.com/x",
+            "add_to_ical": "https://calendar.google.com/x",
+        }
+
+    def test_generate_inserts_one_block_per_event(self):
+        generator = EmailGenerator("design_moderne")
+
+        html = generator.generate(
+            events=[self.make_event("Repas partagé"), self.make_event("Balade")]
+        )
+
+        self.assertNotIn("EVENT_LOOP_START", html)
+        self.assertNotIn("{title}", html)
+        self.assertIn("Repas partagé", html)
+        self.assertIn("Balade", html)
+
+    def test_generate_is_repeatable_with_same_instance(self):
+        generator = EmailGenerator("design_festif")
+        events = [self.make_event("Repas partagé")]
+
+        self.assertEqual(generator.generate(events), generator.generate(events))
+
+    def test_generate_keeps_backslashes_in_event_values(self):
+        html = EmailGenerator("design_minimaliste").generate(
+            events=[self.make_event(r"Atelier C:\dossier\1")]
+        )
+
+        self.assertIn(r"Atelier C:\dossier\1", html)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,343 @@
+import smtplib
+import unittest
+from unittest.mock import Mock, patch
+
+from happy_weekly_mailing.email_sender import EmailSender, _PinnedSMTP
+
+
+def make_sender(**overrides):
+    options = {
+        "smtp_host": "smtp.example.test",
+        "smtp_port": 587,
+        "smtp_user": "happy@example.test",
+        "smtp_password": "secret",
+    }
+    options.update(overrides)
+    return EmailSender(**options)
+
+
+class EmailSenderConnectionTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("happy_weekly_mailing.email_sender.smtplib.SMTP")
+        self.smtp_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.smtp_mock.return_value.has_extn.return_value = False
+
+    def test_send_email_opens_and_closes_its_own_connection(self):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+
+        sent = make_sender().send_email(["a@example.test"], "Sujet", "<p>Bonjour</p>")
+
+        self.assertTrue(sent)
+        server.starttls.assert_called_once()
+        server.login.assert_called_once_with("happy@example.test", "secret")
+        server.send_message.assert_called_once()
+        server.quit.assert_called_once()
+
+    def test_send_email_hides_recipients_in_envelope(self):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+
+        make_sender().send_email(
+            ["a@example.test", "b@example.test"], "Sujet", "<p>Bonjour</p>"
+        )
+
+        msg = server.send_message.call_args.args[0]
+        self.assertEqual(msg["To"], "happy@example.test")
+        self.assertEqual(
+            server.send_message.call_args.kwargs["to_addrs"],
+            ["a@example.test", "b@example.test"],
+        )
+
+    def test_send_email_sends_duplicate_recipients_once(self):
+        server = self.smtp_mock.return_value
+
+        make_sender().send_email(
+            ["a@example.test", "b@example.test", "a@example.test"], "Sujet", "<p>Bonjour</p>"
+        )
+
+        server.send_message.assert_called_once()
+        self.assertEqual(
+            server.send_message.call_args.kwargs["to_addrs"],
+            ["a@example.test", "b@example.test"],
+        )
+
+    def test_context_manager_reuses_one_connection(self):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+        server.noop.return_value = (250, b"OK")
+
+        with make_sender() as sender:
+            sender.send_email(["a@example.test"], "Sujet 1", "<p>1</p>")
+            sender.send_email(["b@example.test"], "Sujet 2", "<p>2</p>")
+
+        smtp_mock.assert_called_once()
+        server.login.assert_called_once()
+        self.assertEqual(server.send_message.call_count, 2)
+        server.quit.assert_called_once()
+
+    def test_dropped_connection_is_reopened(self):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+        server.noop.side_effect = smtplib.SMTPServerDisconnected("bye")
+
+        with make_sender() as sender:
+            sender.NOOP_AFTER_IDLE_SECONDS = 0
+            sender.send_email(["a@example.test"], "Sujet 1", "<p>1</p>")
+            sender.send_email(["b@example.test"], "Sujet 2", "<p>2</p>")
+
+        self.assertEqual(smtp_mock.call_count, 2)
+        self.assertEqual(server.send_message.call_count, 2)
+
+    def test_recently_used_connection_is_not_checked_with_noop(self):
+        server = self.smtp_mock.return_value
+
+        with make_sender() as sender:
+            for address in ["a@example.test", "b@example.test", "c@example.test"]:
+                sender.send_email([address], "Sujet", "<p>Bonjour</p>")
+
+        server.noop.assert_not_called()
+        self.smtp_mock.assert_called_once()
+
+    @patch("happy_weekly_mailing.email_sender.time.sleep")
+    def test_drop_detected_while_sending_reopens_connection(self, _sleep_mock):
+        server = self.smtp_mock.return_value
+        server.send_message.side_effect = [{}, smtplib.SMTPServerDisconnected("bye"), {}]
+
+        with make_sender() as sender:
+            first = sender.send_email(["a@example.test"], "Sujet 1", "<p>1</p>")
+            second = sender.send_email(["b@example.test"], "Sujet 2", "<p>2</p>")
+
+        self.assertTrue(first and second)
+        self.assertEqual(self.smtp_mock.call_count, 2)
+
+    def test_connection_is_recycled_after_message_cap(self):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+        server.noop.return_value = (250, b"OK")
+        sender = make_sender()
+        sender.MAX_MESSAGES_PER_CONNECTION = 2
+        messages = [
+            sender.build_message([f"membre{i}@example.test"], "Sujet", "<p>Bonjour</p>")
+            for i in range(5)
+        ]
+
+        sender.send_bulk(messages)
+
+        self.assertEqual(smtp_mock.call_count, 3)
+        self.assertEqual(server.send_message.call_count, 5)
+
+    @patch("happy_weekly_mailing.email_sender.time.sleep")
+    def test_transient_error_is_retried_on_new_connection(self, sleep_mock):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+        server.send_message.side_effect = [
+            smtplib.SMTPDataError(421, b"Service not available"),
+            {},
+        ]
+
+        sent = make_sender().send_email(["a@example.test"], "Sujet", "<p>Bonjour</p>")
+
+        self.assertTrue(sent)
+        self.assertEqual(smtp_mock.call_count, 2)
+        sleep_mock.assert_called_once_with(1)
+
+    @patch("happy_weekly_mailing.email_sender.time.sleep")
+    def test_permanent_error_is_not_retried(self, sleep_mock):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+        server.send_message.side_effect = smtplib.SMTPDataError(554, b"Rejected")
+
+        sent = make_sender().send_email(["a@example.test"], "Sujet", "<p>Bonjour</p>")
+
+        self.assertFalse(sent)
+        server.send_message.assert_called_once()
+        sleep_mock.assert_not_called()
+
+    def test_send_bulk_sends_every_message_on_one_connection(self):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+        server.noop.return_value = (250, b"OK")
+        sender = make_sender()
+        messages = [
+            sender.build_message([address], "Sujet", "<p>Bonjour</p>")
+            for address in ["a@example.test", "b@example.test", "c@example.test"]
+        ]
+
+        sent = sender.send_bulk(messages)
+
+        self.assertEqual(sent, 3)
+        smtp_mock.assert_called_once()
+        self.assertEqual(server.send_message.call_count, 3)
+        server.quit.assert_called_once()
+
+    def test_send_individually_sends_one_message_per_recipient(self):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+        server.noop.return_value = (250, b"OK")
+        addresses = [f"membre{i}@example.test" for i in range(8)]
+
+        sent = make_sender().send_individually(addresses, "Sujet", "<p>Bonjour</p>", max_workers=3)
+
+        self.assertEqual(sent, 8)
+        recipients = sorted(call.args[0]["To"] for call in server.send_message.call_args_list)
+        self.assertEqual(recipients, sorted(addresses))
+        self.assertLessEqual(smtp_mock.call_count, 3)
+        self.assertEqual(server.quit.call_count, smtp_mock.call_count)
+
+    def test_send_individually_copies_body_and_changes_only_recipient(self):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+        server.noop.return_value = (250, b"OK")
+
+        make_sender().send_individually(
+            ["a@example.test", "b@example.test"], "Événements", "<p>Café à 10h</p>"
+        )
+
+        first, second = (call.args[0] for call in server.send_message.call_args_list)
+        self.assertEqual(first["To"], "a@example.test")
+        self.assertEqual(second["To"], "b@example.test")
+        self.assertEqual(first["Subject"], "Événements")
+        self.assertEqual(first.get_content_type(), "text/html")
+        self.assertEqual(first.get_content(), second.get_content())
+        self.assertIn("Café à 10h", first.get_content())
+
+    def test_send_individually_uses_one_connection_for_few_recipients(self):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+        server.noop.return_value = (250, b"OK")
+
+        sent = make_sender().send_individually(
+            ["a@example.test", "b@example.test"], "Sujet", "<p>Bonjour</p>"
+        )
+
+        self.assertEqual(sent, 2)
+        smtp_mock.assert_called_once()
+
+    def test_send_individually_counts_only_successful_sends(self):
+        smtp_mock = self.smtp_mock
+        server = smtp_mock.return_value
+        server.noop.return_value = (250, b"OK")
+        server.send_message.side_effect = [None, smtplib.SMTPRecipientsRefused({}), None]
+
+        sent = make_sender().send_individually(
+            ["a@example.test", "b@example.test", "c@example.test"], "Sujet", "<p>Bonjour</p>"
+        )
+
+        self.assertEqual(sent, 2)
+
+    def test_send_individually_stops_after_authentication_error(self):
+        login = self.smtp_mock.return_value.login
+        login.side_effect = smtplib.SMTPAuthenticationError(535, b"no")
+        addresses = [f"membre{i}@example.test" for i in range(20)]
+
+        for max_workers in (1, 4):
+            login.reset_mock()
+            with self.assertLogs("happy.email_sender", level="ERROR") as logs:
+                sent = make_sender().send_individually(
+                    addresses, "Sujet", "<p>Bonjour</p>", max_workers=max_workers
+                )
+
+            self.assertEqual(sent, 0)
+            self.assertLessEqual(login.call_count, max_workers)
+            self.assertIn(
+                "✗ Erreur d'authentification SMTP - Vérifiez vos identifiants", logs.output[-1]
+            )
+
+    def test_send_email_reports_authentication_errors(self):
+        smtp_mock = self.smtp_mock
+        smtp_mock.return_value.login.side_effect = smtplib.SMTPAuthenticationError(535, b"no")
+
+        sent = make_sender().send_email(["a@example.test"], "Sujet", "<p>Bonjour</p>")
+
+        self.assertFalse(sent)
+        smtp_mock.return_value.close.assert_called()
+
+
+class EmailSenderPipeliningTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("happy_weekly_mailing.email_sender.smtplib.SMTP")
+        self.server = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.server.has_extn.side_effect = lambda name: name in {"pipelining", "size"}
+        self.server.data.return_value = (250, b"OK")
+
+    def test_envelope_is_sent_in_one_write(self):
+        self.server.getreply.side_effect = [(250, b"OK")] * 3
+
+        sent = make_sender().send_email(
+            ["a@example.test", "b@example.test"], "Sujet", "<p>Bonjour</p>"
+        )
+
+        self.assertTrue(sent)
+        self.server.send.assert_called_once()
+        commands = self.server.send.call_args.args[0].split("\r\n")
+        self.assertTrue(commands[0].startswith("MAIL FROM:<happy@example.test> SIZE="))
+        self.assertEqual(commands[1:3], ["RCPT TO:<a@example.test>", "RCPT TO:<b@example.test>"])
+        self.assertEqual(self.server.getreply.call_count, 3)
+        data = self.server.data.call_args.args[0]
+        self.assertIn(b"To: happy@example.test", data)
+        self.assertNotIn(b"a@example.test", data)
+        self.server.send_message.assert_not_called()
+
+    def test_partially_refused_recipients_still_receive_the_message(self):
+        self.server.getreply.side_effect = [(250, b"OK"), (550, b"Unknown"), (250, b"OK")]
+
+        sent = make_sender().send_email(
+            ["inconnu@example.test", "b@example.test"], "Sujet", "<p>Bonjour</p>"
+        )
+
+        self.assertTrue(sent)
+        self.server.data.assert_called_once()
+
+    def test_all_recipients_refused_aborts_transaction(self):
+        self.server.getreply.side_effect = [(250, b"OK"), (550, b"Unknown")]
+
+        sent = make_sender().send_email(["inconnu@example.test"], "Sujet", "<p>Bonjour</p>")
+
+        self.assertFalse(sent)
+        self.server.rset.assert_called_once()
+        self.server.data.assert_not_called()
+
+
+class EmailSenderPinnedAddressTest(unittest.TestCase):
+    @patch("smtplib.socket.create_connection", side_effect=OSError("stop"))
+    def test_pinned_socket_uses_ip_but_keeps_host_name(self, connect_mock):
+        with self.assertRaises(OSError):
+            _PinnedSMTP("smtp.example.test", 587, pinned_address="192.0.2.25")
+
+        self.assertEqual(connect_mock.call_args.args[0], ("192.0.2.25", 587))
+
+    @patch("happy_weekly_mailing.email_sender._PinnedSMTP", side_effect=OSError("unreachable"))
+    @patch("happy_weekly_mailing.email_sender.smtplib.SMTP")
+    def test_unreachable_ip_falls_back_to_host_name(self, smtp_mock, pinned_mock):
+        smtp_mock.return_value.has_extn.return_value = False
+        on_unreachable_ip = Mock()
+        sender = make_sender(smtp_ip="192.0.2.25", on_unreachable_ip=on_unreachable_ip)
+
+        with sender:
+            self.assertTrue(sender.send_email(["a@example.test"], "Sujet", "<p>1</p>"))
+            sender.NOOP_AFTER_IDLE_SECONDS = 0
+            smtp_mock.return_value.noop.side_effect = smtplib.SMTPServerDisconnected("bye")
+            self.assertTrue(sender.send_email(["b@example.test"], "Sujet", "<p>2</p>"))
+
+        pinned_mock.assert_called_once()
+        self.assertEqual(pinned_mock.call_args.kwargs["timeout"], EmailSender.PINNED_CONNECT_TIMEOUT)
+        on_unreachable_ip.assert_called_once_with()
+        smtp_mock.assert_called_with("smtp.example.test", 587, timeout=30)
+        self.assertEqual(smtp_mock.call_count, 2)
+
+    @patch("happy_weekly_mailing.email_sender._PinnedSMTP")
+    def test_pinned_connection_keeps_normal_timeout_after_connect(self, pinned_mock):
+        server = pinned_mock.return_value
+
+        created = make_sender(smtp_ip="192.0.2.25")._create_server(30)
+
+        self.assertIs(created, server)
+        self.assertEqual(server.timeout, 30)
+        server.sock.settimeout.assert_called_once_with(30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,282 @@
+import io
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from happy_weekly_mailing import main
+
+
+BASE_ENV = {
+    "SMTP_USER": "happy@example.test",
+    "SMTP_PASSWORD": "secret",
+    "TO_ADDRESSES": "a@example.test, b@example.test",
+}
+
+
+@patch("happy_weekly_mailing.main.load_netrc_credentials", return_value=(None, None))
+@patch("happy_weekly_mailing.main.load_dotenv")
+class LoadConfigTest(unittest.TestCase):
+    def load(self, **env):
+        with patch.dict(os.environ, {**BASE_ENV, **env}, clear=True), \
+                patch("happy_weekly_mailing.main.resolve_smtp_host", return_value="192.0.2.25"):
+            return main.load_config()
+
+    def test_load_config_uses_defaults(self, _dotenv_mock, _netrc_mock):
+        config = self.load()
+
+        self.assertEqual(config["calendar_id"], "happy.rouret@gmail.com")
+        self.assertEqual(config["days_ahead"], 14)
+        self.assertEqual(config["smtp_port"], 587)
+        self.assertTrue(config["use_tls"])
+        self.assertEqual(config["smtp_concurrency"], 1)
+        self.assertIsNone(config["website_recap_year"])
+
+    def test_load_config_cleans_recipient_list(self, _dotenv_mock, _netrc_mock):
+        config = self.load(TO_ADDRESSES=" a@example.test,, b@example.test , a@example.test")
+
+        self.assertEqual(config["to_addresses"], ("a@example.test", "b@example.test"))
+
+    def test_load_config_reads_calendar_cache_settings(self, _dotenv_mock, _netrc_mock):
+        default = self.load()
+        custom = self.load(CALENDAR_CACHE_DIR="/tmp/happy-cache", CALENDAR_CACHE_TTL="0")
+
+        self.assertEqual(default["calendar_cache_dir"].name, "happy_weekly_mailing")
+        self.assertEqual(default["calendar_cache_ttl"], 3600)
+        self.assertEqual(str(custom["calendar_cache_dir"]), "/tmp/happy-cache")
+        self.assertEqual(custom["calendar_cache_ttl"], 0)
+
+    def test_load_config_keeps_dns_cache_out_of_calendar_cache_dir(self, _dotenv_mock, _netrc_mock):
+        default = self.load(CALENDAR_CACHE_DIR="/tmp/happy-cache")
+        custom = self.load(DNS_CACHE_FILE="/tmp/happy-dns.json")
+
+        self.assertEqual(default["dns_cache_file"].parent.name, "happy_weekly_mailing")
+        self.assertEqual(default["dns_cache_file"].name, "dns.json")
+        self.assertEqual(str(custom["dns_cache_file"]), "/tmp/happy-dns.json")
+
+    def test_load_config_reads_smtp_concurrency(self, _dotenv_mock, _netrc_mock):
+        self.assertEqual(self.load(SMTP_CONCURRENCY="4")["smtp_concurrency"], 4)
+        self.assertEqual(self.load(SMTP_CONCURRENCY="")["smtp_concurrency"], 1)
+
+    def test_load_config_uses_defaults_for_empty_variables(self, _dotenv_mock, _netrc_mock):
+        config = self.load(DAYS_AHEAD="", SMTP_PORT="", TIMEZONE="", WEBSITE_RECAP_YEAR="")
+
+        self.assertEqual(config["days_ahead"], 14)
+        self.assertEqual(config["smtp_port"], 587)
+        self.assertEqual(config["timezone"], "Europe/Paris")
+        self.assertIsNone(config["website_recap_year"])
+
+    def test_load_config_casts_values(self, _dotenv_mock, _netrc_mock):
+        config = self.load(
+            DAYS_AHEAD="21",
+            WEBSITE_RECAP_YEAR="2025",
+            WEBSITE_RECAP_ENABLED="false",
+            SMTP_USE_TLS="false",
+        )
+
+        self.assertEqual(config["days_ahead"], 21)
+        self.assertEqual(config["website_recap_year"], 2025)
+        self.assertFalse(config["website_recap_enabled"])
+        self.assertFalse(config["use_tls"])
+
+    def test_load_config_builds_timezone_once(self, _dotenv_mock, _netrc_mock):
+        config = self.load(TIMEZONE="America/Montreal")
+
+        self.assertEqual(config["tz"].key, "America/Montreal")
+        self.assertTrue(main.validate_config(config)[0])
+
+    def test_unknown_timezone_is_reported_by_validation(self, _dotenv_mock, _netrc_mock):
+        config = self.load(TIMEZONE="Europe/Atlantide")
+
+        is_valid, error_msg = main.validate_config(config)
+
+        self.assertFalse(is_valid)
+        self.assertIn("Europe/Atlantide", error_msg)
+
+    def test_load_config_accepts_common_boolean_spellings(self, _dotenv_mock, _netrc_mock):
+        for value in ("TRUE", " True ", "1", "yes", "on"):
+            self.assertTrue(self.load(SMTP_USE_TLS=value)["use_tls"], value)
+        for value in ("false", "0", "no", "off"):
+            self.assertFalse(self.load(SMTP_USE_TLS=value)["use_tls"], value)
+
+    def test_load_config_prefers_netrc_credentials(self, _dotenv_mock, netrc_mock):
+        netrc_mock.return_value = ("netrc@example.test", "netrc-secret")
+
+        config = self.load()
+
+        self.assertEqual(config["smtp_user"], "netrc@example.test")
+        self.assertEqual(config["smtp_password"], "netrc-secret")
+        self.assertTrue(config["using_netrc"])
+
+
+class NetrcCredentialsTest(unittest.TestCase):
+    def setUp(self):
+        self.home = Path(tempfile.mkdtemp())
+        patcher = patch("happy_weekly_mailing.main.Path.home", return_value=self.home)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.netrc_path = self.home / ".netrc"
+
+    def write_netrc(self, login, mtime_ns):
+        self.netrc_path.write_text(f"machine smtp.example.test login {login} password secret\n")
+        self.netrc_path.chmod(0o600)
+        os.utime(self.netrc_path, ns=(mtime_ns, mtime_ns))
+
+    def test_missing_netrc_returns_none(self):
+        self.assertEqual(main.load_netrc_credentials("smtp.example.test"), (None, None))
+
+    @patch("netrc.netrc", wraps=__import__("netrc").netrc)
+    def test_netrc_is_parsed_again_only_when_modified(self, netrc_mock):
+        self.write_netrc("first@example.test", 1_000_000_000)
+
+        first = main.load_netrc_credentials("smtp.example.test")
+        again = main.load_netrc_credentials("smtp.example.test")
+        self.write_netrc("second@example.test", 2_000_000_000)
+        updated = main.load_netrc_credentials("smtp.example.test")
+
+        self.assertEqual(first, ("first@example.test", "secret"))
+        self.assertEqual(again, first)
+        self.assertEqual(updated, ("second@example.test", "secret"))
+        self.assertEqual(netrc_mock.call_count, 2)
+
+
+@patch("happy_weekly_mailing.main.socket.getaddrinfo")
+class ResolveSmtpHostTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_file = Path(tempfile.mkdtemp()) / "dns.json"
+
+    def test_address_is_cached_for_an_hour(self, getaddrinfo_mock):
+        getaddrinfo_mock.return_value = [(2, 1, 6, "", ("192.0.2.25", 587))]
+
+        first = main.resolve_smtp_host("smtp.example.test", 587, self.cache_file)
+        second = main.resolve_smtp_host("smtp.example.test", 587, self.cache_file)
+
+        self.assertEqual((first, second), ("192.0.2.25", "192.0.2.25"))
+        getaddrinfo_mock.assert_called_once()
+
+        with patch("happy_weekly_mailing.main.time.time", return_value=time.time() + 3601):
+            main.resolve_smtp_host("smtp.example.test", 587, self.cache_file)
+        self.assertEqual(getaddrinfo_mock.call_count, 2)
+
+    def test_forgotten_address_is_resolved_again(self, getaddrinfo_mock):
+        getaddrinfo_mock.return_value = [(2, 1, 6, "", ("192.0.2.25", 587))]
+        main.resolve_smtp_host("smtp.example.test", 587, self.cache_file)
+        main.resolve_smtp_host("other.example.test", 587, self.cache_file)
+
+        main.forget_smtp_host("smtp.example.test", 587, self.cache_file)
+        main.resolve_smtp_host("smtp.example.test", 587, self.cache_file)
+        main.resolve_smtp_host("other.example.test", 587, self.cache_file)
+
+        self.assertEqual(getaddrinfo_mock.call_count, 3)
+        self.assertEqual(list(self.cache_file.parent.iterdir()), [self.cache_file])
+
+    def test_resolution_failure_returns_none(self, getaddrinfo_mock):
+        getaddrinfo_mock.side_effect = socket.gaierror("no DNS")
+
+        self.assertIsNone(main.resolve_smtp_host("smtp.example.test", 587, self.cache_file))
+        self.assertFalse(self.cache_file.exists())
+
+    def test_slow_resolution_is_abandoned(self, getaddrinfo_mock):
+        released = threading.Event()
+        self.addCleanup(released.set)
+        getaddrinfo_mock.side_effect = lambda *args, **kwargs: released.wait(5)
+
+        with patch("happy_weekly_mailing.main._DNS_TIMEOUT", 0.05):
+            started = time.monotonic()
+            address = main.resolve_smtp_host("smtp.example.test", 587, self.cache_file)
+
+        self.assertIsNone(address)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertFalse(self.cache_file.exists())
+
+
+class QuickCheckTest(unittest.TestCase):
+    def setUp(self):
+        self.home = Path(tempfile.mkdtemp())
+        for patcher in (
+            patch("happy_weekly_mailing.main.Path.home", return_value=self.home),
+            patch("happy_weekly_mailing.main._ENV_PATH", self.home / ".env"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def check(self, **env):
+        with patch.dict(os.environ, env, clear=True):
+            return main._quick_check()
+
+    def test_complete_environment_passes(self):
+        self.assertIsNone(self.check(**BASE_ENV))
+
+    def test_missing_recipients_fail_without_env_file(self):
+        self.assertIn("TO_ADDRESSES", self.check(SMTP_USER="u", SMTP_PASSWORD="p"))
+
+    def test_missing_credentials_fail_without_netrc(self):
+        error_msg = self.check(TO_ADDRESSES="a@example.test", SMTP_USER="u")
+
+        self.assertIn("SMTP_PASSWORD", error_msg)
+        self.assertNotIn("SMTP_USER", error_msg)
+
+    def test_netrc_file_replaces_credentials(self):
+        (self.home / ".netrc").touch()
+
+        self.assertIsNone(self.check(TO_ADDRESSES="a@example.test"))
+
+    def test_env_file_defers_to_full_validation(self):
+        (self.home / ".env").touch()
+
+        self.assertIsNone(self.check())
+
+    @patch("happy_weekly_mailing.main.load_config")
+    def test_main_stops_before_loading_configuration(self, load_config_mock):
+        with patch.dict(os.environ, {}, clear=True), \
+                patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.assertEqual(main.main(), 1)
+
+        load_config_mock.assert_not_called()
+        self.assertIn("TO_ADDRESSES", stdout.getvalue())
+
+    def test_module_messages_follow_log_level(self):
+        with patch.dict(os.environ, {"LOG_LEVEL": "WARNING"}, clear=True), \
+                patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            handler = main._setup_logging()
+            try:
+                logging.getLogger("happy.email_sender").info("✓ Email envoyé")
+                logging.getLogger("happy.calendar_fetcher").warning("Cache non enregistré")
+            finally:
+                main.logger.removeHandler(handler)
+                handler.close()
+
+        self.assertNotIn("Email envoyé", stdout.getvalue())
+        self.assertIn("Cache non enregistré", stdout.getvalue())
+
+    @patch("happy_weekly_mailing.main.load_config")
+    def test_log_level_hides_status_but_keeps_errors(self, load_config_mock):
+        load_config_mock.return_value = {"to_addresses": (), "using_netrc": True}
+        env = {**BASE_ENV, "LOG_LEVEL": "warning"}
+
+        with patch.dict(os.environ, env, clear=True), \
+                patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.assertEqual(main.main(), 1)
+
+        self.assertNotIn("Happy au Rouret", stdout.getvalue())
+        self.assertIn("✗ Erreur", stdout.getvalue())
+        self.assertEqual(main.logger.handlers, [])
+
+
+@patch("happy_weekly_mailing.main.load_dotenv")
+class LoadDotenvTest(unittest.TestCase):
+    @patch("happy_weekly_mailing.main._DOTENV_LOADED", False)
+    def test_dotenv_is_loaded_once(self, dotenv_mock):
+        main._load_dotenv_once()
+        main._load_dotenv_once()
+
+        dotenv_mock.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()